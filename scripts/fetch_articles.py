@@ -15,7 +15,7 @@ import asyncio
 import aiohttp
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 import requests
 from urllib.parse import urlparse
 from collections import defaultdict
@@ -34,8 +34,33 @@ except ImportError:
         PLAYWRIGHT_SYNC_ONLY = False
         print("⚠️  Playwright non installé. Installez-le avec: pip install playwright && playwright install chromium")
 
+# httpx (avec le support HTTP/2 fourni par h2) multiplexe les requêtes vers un même hôte
+try:
+    import httpx
+    import h2  # noqa: F401 - requis par httpx pour http2=True
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+# Délai (en secondes) entre deux requêtes vers un même site, en mode synchrone
+# comme asynchrone. Délai plus long pour les sites stricts (protection anti-bot).
+_FETCH_DELAYS = {
+    'lemonde.fr': 3,
+    'france24.com': 3,
+    'lesechos.fr': 3,
+}
+_DEFAULT_FETCH_DELAY = 2
+
+# Requêtes simultanées au plus vers un même site en mode asynchrone
+_MAX_REQUESTS_PER_HOST = 3
+
+
+def _delay_for(domain: str) -> float:
+    """Retourne la pause à respecter après une requête vers ce domaine."""
+    return _FETCH_DELAYS.get(domain, _DEFAULT_FETCH_DELAY)
+
 
 class ArticleFetcher:
     """Télécharge et stocke les articles HTML."""
@@ -52,6 +77,7 @@ class ArticleFetcher:
         
         # Charger la configuration des médias pour filtrer les URLs
         self.medias = self._load_medias_config()
+        self.allowed_domains = frozenset(media['domain'] for media in self.medias.get('medias', []))
         
         # Session requests pour les sites qui ne bloquent pas (fallback)
         self.session = requests.Session()
@@ -76,15 +102,11 @@ class ArticleFetcher:
         self.browser = None
         self.use_playwright_for = {'france24.com', 'lemonde.fr', 'lesechos.fr'}  # Sites nécessitant Playwright
         
-        # Limites de rate par domaine (pour éviter de surcharger)
-        self.domain_delays = {
-            'lemonde.fr': 1.0,  # 1 seconde entre requêtes
-            'france24.com': 1.0,
-            'default': 0.5  # 0.5 seconde par défaut
-        }
-        
-        # Dernière requête par domaine (pour respecter les délais)
+        # Dernière requête (planifiée) par domaine, pour respecter _delay_for en asynchrone
         self.domain_last_request = defaultdict(float)
+        
+        # Hashes des pages déjà sur disque (rempli par _scan_fetched_hashes)
+        self._fetched_hashes: Optional[set] = None
     
     def _load_medias_config(self) -> Dict:
         """Charge la configuration des médias."""
@@ -105,9 +127,35 @@ class ArticleFetcher:
     
     def _is_allowed_domain(self, url: str) -> bool:
         """Vérifie si l'URL appartient à un média configuré."""
-        domain = self._extract_domain(url)
-        allowed_domains = {media['domain'] for media in self.medias.get('medias', [])}
-        return domain in allowed_domains if allowed_domains else True  # Si aucun média configuré, tout accepter
+        if not self.allowed_domains:
+            return True  # Si aucun média configuré, tout accepter
+        return self._extract_domain(url) in self.allowed_domains
+    
+    def _load_urls_to_fetch(self) -> Tuple[list, Dict[str, int]]:
+        """Charge les couples (URL, domaine) restant à télécharger et compte les URLs ignorées par domaine."""
+        # Charger le log existant
+        fetch_log = self._load_fetch_log()
+        already_processed = {url for url, log in fetch_log.items() if log['status'] == 'success'}
+        
+        self._fetched_hashes = self._scan_fetched_hashes()
+        
+        urls_to_fetch = []
+        ignored_domains = defaultdict(int)
+        
+        with open(self.urls_clean_file, 'r', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                url = row['url']
+                if url in already_processed:
+                    continue
+                # Filtrer par domaine si des médias sont configurés
+                domain = self._extract_domain(url)
+                if not self.allowed_domains or domain in self.allowed_domains:
+                    urls_to_fetch.append((url, domain))
+                else:
+                    ignored_domains[domain] += 1
+        
+        return urls_to_fetch, dict(ignored_domains)
     
     async def _init_playwright_async(self):
         """Initialise Playwright en mode asynchrone si disponible."""
@@ -258,8 +306,22 @@ class ArticleFetcher:
         subdir.mkdir(exist_ok=True)
         return subdir / f"{url_hash}.html"
     
+    def _scan_fetched_hashes(self) -> set:
+        """Liste en une passe les hashes des fichiers HTML déjà présents dans raw_html/."""
+        hashes = set()
+        with os.scandir(self.raw_html_dir) as subdirs:
+            for subdir in subdirs:
+                if not subdir.is_dir():
+                    continue
+                with os.scandir(subdir.path) as entries:
+                    hashes.update(entry.name.split('.', 1)[0] for entry in entries)
+        return hashes
+    
     def _is_already_fetched(self, url: str) -> bool:
         """Vérifie si l'URL a déjà été téléchargée."""
+        if self._fetched_hashes is not None:
+            # Test en mémoire plutôt qu'un stat() par URL
+            return self._url_to_hash(url) in self._fetched_hashes
         file_path = self._get_file_path(url)
         return file_path.exists()
     
@@ -277,6 +339,9 @@ class ArticleFetcher:
         """Enregistre le résultat du téléchargement dans le log."""
         file_exists = self.fetch_log_file.exists()
         
+        if status == 'success' and self._fetched_hashes is not None:
+            self._fetched_hashes.add(self._url_to_hash(url))
+        
         with open(self.fetch_log_file, 'a', newline='', encoding='utf-8') as f:
             fieldnames = ['url', 'status', 'error', 'fetch_date', 'file_path']
             writer = csv.DictWriter(f, fieldnames=fieldnames)
@@ -294,18 +359,29 @@ class ArticleFetcher:
             })
     
     async def _wait_for_domain_rate_limit(self, domain: str):
-        """Attend si nécessaire pour respecter le rate limiting par domaine."""
-        delay = self.domain_delays.get(domain, self.domain_delays['default'])
-        last_request = self.domain_last_request[domain]
-        elapsed = time.time() - last_request
-        
-        if elapsed < delay:
-            await asyncio.sleep(delay - elapsed)
-        
-        self.domain_last_request[domain] = time.time()
+        """Attend si nécessaire pour respecter le délai par domaine (_delay_for, comme en synchrone)."""
+        # Le créneau est réservé avant d'attendre : des tâches concurrentes vers
+        # le même site sont espacées du délai au lieu de partir ensemble
+        now = time.time()
+        slot = max(now, self.domain_last_request[domain] + _delay_for(domain))
+        self.domain_last_request[domain] = slot
+        
+        if slot > now:
+            await asyncio.sleep(slot - now)
+    
+    async def _http_get_async(self, session, url: str, headers: Dict[str, str]) -> Tuple[int, str, bytes]:
+        """Effectue un GET avec httpx (HTTP/2) ou aiohttp selon la session fournie."""
+        if HTTPX_AVAILABLE and isinstance(session, httpx.AsyncClient):
+            # Laisser httpx négocier l'encodage qu'il sait décoder
+            headers = {k: v for k, v in headers.items() if k != 'Accept-Encoding'}
+            response = await session.get(url, headers=headers, timeout=15, follow_redirects=True)
+            return response.status_code, response.headers.get('Content-Type', ''), response.content
+        
+        async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=15), allow_redirects=True) as response:
+            return response.status, response.headers.get('Content-Type', ''), await response.read()
     
-    async def fetch_url_async(self, session: aiohttp.ClientSession, url: str) -> bool:
-        """Télécharge une URL de manière asynchrone."""
+    async def fetch_url_async(self, session, url: str) -> bool:
+        """Télécharge une URL de manière asynchrone (session httpx ou aiohttp)."""
         # Vérifier si déjà téléchargé
         if self._is_already_fetched(url):
             return True
@@ -328,7 +404,7 @@ class ArticleFetcher:
                     self._save_fetch_log(url, 'success')
                     return True
             
-            # Utiliser aiohttp pour les autres sites
+            # Utiliser httpx/aiohttp pour les autres sites
             domain_full = f"{parsed_url.scheme}://{parsed_url.netloc}"
             base_url = f"{parsed_url.scheme}://{parsed_url.netloc}/"
             
@@ -343,62 +419,62 @@ class ArticleFetcher:
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             }
             
-            async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=15), allow_redirects=True) as response:
-                # Gérer les erreurs 403 et 406
-                if response.status in [403, 406]:
-                    if PLAYWRIGHT_AVAILABLE:
-                        html_content = await self._fetch_with_playwright_async(url)
-                        if html_content:
-                            file_path = self._get_file_path(url)
-                            with open(file_path, 'w', encoding='utf-8') as f:
-                                f.write(html_content)
-                            self._save_fetch_log(url, 'success')
-                            return True
-                    self._save_fetch_log(url, 'error', f"HTTP {response.status}: Site bloque les requêtes automatisées")
-                    return False
-                
-                response.raise_for_status()
-                
-                # Vérifier le Content-Type
-                content_type = response.headers.get('Content-Type', '').lower()
-                if 'text/html' not in content_type:
-                    self._save_fetch_log(url, 'skipped', f"Non-HTML: {content_type}")
-                    return False
-                
-                # Sauvegarder le HTML
-                html_content = await response.read()
-                
-                # Vérifier si le contenu contient "Access Denied" ou des erreurs de blocage
-                html_text = html_content.decode('utf-8', errors='ignore').lower()
-                if 'access denied' in html_text or 'accès refusé' in html_text or 'access forbidden' in html_text:
-                    # Réessayer avec Playwright si disponible
-                    if PLAYWRIGHT_AVAILABLE:
-                        print(f"    ⚠️  Access Denied détecté, tentative avec Playwright...")
-                        html_content_playwright = await self._fetch_with_playwright_async(url)
-                        if html_content_playwright and 'access denied' not in html_content_playwright.lower():
-                            file_path = self._get_file_path(url)
-                            with open(file_path, 'w', encoding='utf-8') as f:
-                                f.write(html_content_playwright)
-                            self._save_fetch_log(url, 'success')
-                            return True
-                    self._save_fetch_log(url, 'error', 'Access Denied - Site bloque l\'accès')
-                    return False
-                
-                file_path = self._get_file_path(url)
-                with open(file_path, 'wb') as f:
-                    f.write(html_content)
-                
-                self._save_fetch_log(url, 'success')
-                return True
+            status, content_type, html_content = await self._http_get_async(session, url, headers)
+            
+            # Gérer les erreurs 403 et 406
+            if status in [403, 406]:
+                if PLAYWRIGHT_AVAILABLE:
+                    html_content = await self._fetch_with_playwright_async(url)
+                    if html_content:
+                        file_path = self._get_file_path(url)
+                        with open(file_path, 'w', encoding='utf-8') as f:
+                            f.write(html_content)
+                        self._save_fetch_log(url, 'success')
+                        return True
+                self._save_fetch_log(url, 'error', f"HTTP {status}: Site bloque les requêtes automatisées")
+                return False
+            
+            if status >= 400:
+                self._save_fetch_log(url, 'error', f"HTTP {status}")
+                return False
+            
+            # Vérifier le Content-Type
+            content_type = content_type.lower()
+            if 'text/html' not in content_type:
+                self._save_fetch_log(url, 'skipped', f"Non-HTML: {content_type}")
+                return False
+            
+            # Vérifier si le contenu contient "Access Denied" ou des erreurs de blocage
+            html_text = html_content.decode('utf-8', errors='ignore').lower()
+            if 'access denied' in html_text or 'accès refusé' in html_text or 'access forbidden' in html_text:
+                # Réessayer avec Playwright si disponible
+                if PLAYWRIGHT_AVAILABLE:
+                    print(f"    ⚠️  Access Denied détecté, tentative avec Playwright...")
+                    html_content_playwright = await self._fetch_with_playwright_async(url)
+                    if html_content_playwright and 'access denied' not in html_content_playwright.lower():
+                        file_path = self._get_file_path(url)
+                        with open(file_path, 'w', encoding='utf-8') as f:
+                            f.write(html_content_playwright)
+                        self._save_fetch_log(url, 'success')
+                        return True
+                self._save_fetch_log(url, 'error', 'Access Denied - Site bloque l\'accès')
+                return False
+            
+            # Sauvegarder le HTML
+            file_path = self._get_file_path(url)
+            with open(file_path, 'wb') as f:
+                f.write(html_content)
+            
+            self._save_fetch_log(url, 'success')
+            return True
         
         except asyncio.TimeoutError:
             self._save_fetch_log(url, 'error', 'Timeout')
             return False
-        except aiohttp.ClientError as e:
-            error_msg = str(e)
-            self._save_fetch_log(url, 'error', error_msg)
-            return False
         except Exception as e:
+            if HTTPX_AVAILABLE and isinstance(e, httpx.TimeoutException):
+                self._save_fetch_log(url, 'error', 'Timeout')
+                return False
             error_msg = str(e)
             self._save_fetch_log(url, 'error', error_msg)
             return False
@@ -553,28 +629,9 @@ class ArticleFetcher:
         
         print("📥 Début du téléchargement des articles (mode asynchrone)...")
         
-        # Charger le log existant
-        fetch_log = self._load_fetch_log()
-        already_processed = {url for url, log in fetch_log.items() if log['status'] == 'success'}
-        
-        urls_to_fetch = []
-        allowed_domains = {media['domain'] for media in self.medias.get('medias', [])}
-        ignored_count = 0
-        ignored_domains = {}
-        
-        with open(self.urls_clean_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                url = row['url']
-                # Filtrer par domaine si des médias sont configurés
-                if url not in already_processed:
-                    if not allowed_domains or self._is_allowed_domain(url):
-                        urls_to_fetch.append(url)
-                    else:
-                        # Compter les URLs ignorées par domaine
-                        ignored_count += 1
-                        domain = self._extract_domain(url)
-                        ignored_domains[domain] = ignored_domains.get(domain, 0) + 1
+        urls_to_fetch, ignored_domains = self._load_urls_to_fetch()
+        allowed_domains = self.allowed_domains
+        ignored_count = sum(ignored_domains.values())
         
         total = len(urls_to_fetch)
         if ignored_count > 0:
@@ -588,26 +645,38 @@ class ArticleFetcher:
             print("✅ Toutes les URLs ont déjà été téléchargées")
             return
         
-        # Créer une session aiohttp avec nettoyage automatique
-        connector = aiohttp.TCPConnector(
-            limit=max_concurrent, 
-            limit_per_host=3,
-            force_close=True,  # Forcer la fermeture des connexions
-            enable_cleanup_closed=True  # Nettoyer les connexions fermées
-        )
-        timeout = aiohttp.ClientTimeout(total=30)
-        
         success_count = 0
         error_count = 0
         completed = 0
         
-        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        if HTTPX_AVAILABLE:
+            # Client HTTP/2 : les requêtes vers un même hôte partagent une connexion TLS
+            session_cm = httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+                timeout=30
+            )
+        else:
+            # Créer une session aiohttp avec nettoyage automatique
+            connector = aiohttp.TCPConnector(
+                limit=max_concurrent, 
+                limit_per_host=_MAX_REQUESTS_PER_HOST,
+                force_close=True,  # Forcer la fermeture des connexions
+                enable_cleanup_closed=True  # Nettoyer les connexions fermées
+            )
+            session_cm = aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=30))
+        
+        async with session_cm as session:
             # Créer un sémaphore pour limiter le nombre de requêtes simultanées
             semaphore = asyncio.Semaphore(max_concurrent)
+            # Plafond par site : avec HTTP/2, httpx multiplexe toutes les requêtes
+            # d'un hôte sur une connexion, limit_per_host ne s'applique donc pas
+            host_semaphores = defaultdict(lambda: asyncio.Semaphore(_MAX_REQUESTS_PER_HOST))
             
-            async def fetch_with_semaphore(url):
+            async def fetch_with_semaphore(url, domain):
                 nonlocal success_count, error_count, completed
-                async with semaphore:
+                # Place du site d'abord, pour ne pas bloquer un créneau global en attendant
+                async with host_semaphores[domain], semaphore:
                     completed += 1
                     print(f"[{completed}/{total}]", end=" ")
                     print(f"📥 {url[:60]}...")
@@ -619,7 +688,7 @@ class ArticleFetcher:
                         error_count += 1
             
             # Créer toutes les tâches
-            tasks = [fetch_with_semaphore(url) for url in urls_to_fetch]
+            tasks = [fetch_with_semaphore(url, domain) for url, domain in urls_to_fetch]
             
             # Exécuter toutes les tâches
             await asyncio.gather(*tasks)
@@ -649,28 +718,9 @@ class ArticleFetcher:
         
         print("📥 Début du téléchargement des articles...")
         
-        # Charger le log existant
-        fetch_log = self._load_fetch_log()
-        already_processed = {url for url, log in fetch_log.items() if log['status'] == 'success'}
-        
-        urls_to_fetch = []
-        allowed_domains = {media['domain'] for media in self.medias.get('medias', [])}
-        ignored_count = 0
-        ignored_domains = {}
-        
-        with open(self.urls_clean_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                url = row['url']
-                # Filtrer par domaine si des médias sont configurés
-                if url not in already_processed:
-                    if not allowed_domains or self._is_allowed_domain(url):
-                        urls_to_fetch.append(url)
-                    else:
-                        # Compter les URLs ignorées par domaine
-                        ignored_count += 1
-                        domain = self._extract_domain(url)
-                        ignored_domains[domain] = ignored_domains.get(domain, 0) + 1
+        urls_to_fetch, ignored_domains = self._load_urls_to_fetch()
+        allowed_domains = self.allowed_domains
+        ignored_count = sum(ignored_domains.values())
         
         total = len(urls_to_fetch)
         if ignored_count > 0:
@@ -686,7 +736,7 @@ class ArticleFetcher:
         success_count = 0
         error_count = 0
         
-        for i, url in enumerate(urls_to_fetch, 1):
+        for i, (url, domain) in enumerate(urls_to_fetch, 1):
             print(f"[{i}/{total}]", end=" ")
             if self.fetch_url(url):
                 success_count += 1
@@ -694,16 +744,7 @@ class ArticleFetcher:
                 error_count += 1
             
             # Pause pour respecter les robots.txt et éviter de surcharger
-            # Délai plus long pour les sites stricts
-            parsed_url = urlparse(url)
-            if 'lemonde.fr' in parsed_url.netloc:
-                time.sleep(3)  # 3 secondes pour Le Monde
-            elif 'france24.com' in parsed_url.netloc:
-                time.sleep(3)  # 3 secondes pour France 24 (protection anti-bot)
-            elif 'lesechos.fr' in parsed_url.netloc:
-                time.sleep(3)  # 3 secondes pour Les Echos (protection anti-bot)
-            else:
-                time.sleep(2)  # 2 secondes pour les autres sites
+            time.sleep(_delay_for(domain))
         
         print(f"\n✅ Téléchargement terminé:")
         print(f"   ✅ Succès: {success_count}")
@@ -727,6 +768,13 @@ async def main_async():
 
 def main():
     """Point d'entrée principal (utilise asyncio si disponible)."""
+    # Boucle d'événements uvloop (libuv) si disponible : indisponible sous Windows
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
     try:
         # Utiliser asyncio.run() qui gère mieux la fermeture sur Windows
         asyncio.run(main_async())
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Éléments communs aux scripts de filtrage des données existantes
+(filter_franceculture.py, filter_old_articles.py).
+"""
+
+import os
+import gzip
+from pathlib import Path
+from dotenv import load_dotenv
+
+BASE_DIR = Path(__file__).parent.parent
+DATA_DIR = BASE_DIR / "data"
+
+# STATS_PRETTY peut être défini dans .env (voir env.example.txt)
+load_dotenv(BASE_DIR / ".env")
+
+# stats_daily.json est lu par le dashboard : JSON compact sauf si STATS_PRETTY=true
+STATS_JSON_INDENT = 2 if os.getenv('STATS_PRETTY', 'False').lower() == 'true' else None
+
+
+def data_file(name: str) -> Path:
+    """Chemin d'un fichier de données, en version compressée (.gz) si seule celle-ci existe."""
+    path = DATA_DIR / name
+    gz_path = path.with_name(path.name + '.gz')
+    if not path.exists() and gz_path.exists():
+        return gz_path
+    return path
+
+
+def open_csv(path: Path, mode: str):
+    """Ouvre un CSV en mode texte, décompressé à la volée s'il se termine par .gz."""
+    if path.suffix == '.gz':
+        # Compression rapide : on réécrit le fichier, on ne cherche pas le meilleur ratio
+        return gzip.open(path, mode + 't', encoding='utf-8', newline='', compresslevel=1)
+    return open(path, mode, encoding='utf-8', newline='')
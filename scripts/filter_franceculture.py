@@ -4,48 +4,63 @@
 Script pour supprimer tous les articles de franceculture.fr des données existantes.
 """
 
+import os
 import csv
 import json
 from pathlib import Path
 from typing import Set
+from urllib.parse import urlparse
+
+from filter_common import DATA_DIR, STATS_JSON_INDENT, data_file, open_csv
 
 # Augmenter la limite de taille de champ CSV
 csv.field_size_limit(50 * 1024 * 1024)  # 50MB
 
-BASE_DIR = Path(__file__).parent.parent
-DATA_DIR = BASE_DIR / "data"
+def _url_on_domain(url: str, domain: str) -> bool:
+    """Vrai si l'hôte de l'URL est le domaine ou l'un de ses sous-domaines (pas notfranceculture.fr)."""
+    host = urlparse(url).hostname or ''
+    return host == domain or host.endswith('.' + domain)
 
 def filter_csv_file(file_path: Path, domain_to_remove: str = "franceculture.fr") -> int:
     """Filtre un fichier CSV pour supprimer les lignes avec le domaine spécifié."""
     if not file_path.exists():
         return 0
     
-    # Lire toutes les lignes
-    rows = []
     removed_count = 0
+    # Les lignes conservées sont écrites au fil de la lecture dans un fichier temporaire
+    tmp_path = file_path.with_name(file_path.stem + '.tmp' + file_path.suffix)
     
-    with open(file_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        fieldnames = reader.fieldnames
-        
-        for row in reader:
-            # Vérifier si le domaine correspond
-            domain = row.get('domain', '')
-            url = row.get('url', '')
-            
-            if domain == domain_to_remove or domain_to_remove in url:
-                removed_count += 1
-                continue
-            
-            rows.append(row)
-    
-    # Réécrire le fichier sans les lignes filtrées
-    if removed_count > 0:
-        with open(file_path, 'w', newline='', encoding='utf-8') as f:
-            if rows and fieldnames:
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
+    try:
+        with open_csv(file_path, 'r') as f, open_csv(tmp_path, 'w') as out:
+            reader = csv.DictReader(f)
+            writer = csv.DictWriter(out, fieldnames=reader.fieldnames or [])
+            if reader.fieldnames:
                 writer.writeheader()
-                writer.writerows(rows)
+            
+            for row in reader:
+                # Vérifier si le domaine correspond (la colonne domain fait foi,
+                # l'URL n'est analysée que si elle est vide)
+                domain = row.get('domain', '')
+                if domain:
+                    match = domain == domain_to_remove
+                else:
+                    match = _url_on_domain(row.get('url', ''), domain_to_remove)
+                
+                if match:
+                    removed_count += 1
+                    continue
+                
+                writer.writerow(row)
+        
+        # Remplacer le fichier seulement si des lignes ont été supprimées
+        if removed_count > 0:
+            os.replace(tmp_path, file_path)
+        else:
+            tmp_path.unlink()
+    except BaseException:
+        # Lecture ou écriture interrompue : ne pas laisser le fichier temporaire
+        tmp_path.unlink(missing_ok=True)
+        raise
     
     return removed_count
 
@@ -89,40 +104,35 @@ def filter_json_stats(file_path: Path, domain_to_remove: str = "franceculture.fr
     # Mettre à jour le total d'articles
     if 'total_articles' in data:
         # Recalculer le total en comptant les articles restants
-        total = 0
-        if 'medias' in data:
-            for media in data['medias']:
-                total += media.get('n_articles', 0)
-        data['total_articles'] = total
+        data['total_articles'] = sum(media.get('n_articles', 0) for media in data.get('medias', []))
     
     # Sauvegarder
     if removed_count > 0:
         with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+            json.dump(data, f, ensure_ascii=False, indent=STATS_JSON_INDENT)
     
     return removed_count
 
 def get_franceculture_urls() -> Set[str]:
     """Récupère toutes les URLs de franceculture pour les supprimer des fichiers HTML."""
+    needle = 'franceculture.fr'
     urls = set()
     
-    # Chercher dans urls_clean.csv
-    urls_file = DATA_DIR / "urls_clean.csv"
-    if urls_file.exists():
-        with open(urls_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if row.get('domain', '') == 'franceculture.fr' or 'franceculture.fr' in row.get('url', ''):
-                    urls.add(row['url'])
-    
-    # Chercher dans articles_clean.csv
-    articles_file = DATA_DIR / "articles_clean.csv"
-    if articles_file.exists():
-        with open(articles_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if row.get('domain', '') == 'franceculture.fr' or 'franceculture.fr' in row.get('url', ''):
-                    urls.add(row['url'])
+    # Chercher dans urls_clean.csv puis articles_clean.csv
+    for csv_file in (data_file("urls_clean.csv"), data_file("articles_clean.csv")):
+        if not csv_file.exists():
+            continue
+        with open_csv(csv_file, 'r') as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if not header or 'url' not in header:
+                continue
+            url_i = header.index('url')
+            # Recherche de sous-chaîne en présélection, puis vérification de l'hôte
+            urls.update(
+                row[url_i] for row in reader
+                if len(row) > url_i and needle in row[url_i] and _url_on_domain(row[url_i], needle)
+            )
     
     return urls
 
@@ -135,25 +145,25 @@ def main():
     
     # 1. Filtrer urls_raw.csv
     print("\n📄 Filtrage de urls_raw.csv...")
-    removed = filter_csv_file(DATA_DIR / "urls_raw.csv", domain)
+    removed = filter_csv_file(data_file("urls_raw.csv"), domain)
     total_removed += removed
     print(f"   ✅ {removed} ligne(s) supprimée(s)")
     
     # 2. Filtrer urls_clean.csv
     print("\n📄 Filtrage de urls_clean.csv...")
-    removed = filter_csv_file(DATA_DIR / "urls_clean.csv", domain)
+    removed = filter_csv_file(data_file("urls_clean.csv"), domain)
     total_removed += removed
     print(f"   ✅ {removed} ligne(s) supprimée(s)")
     
     # 3. Filtrer articles_clean.csv
     print("\n📄 Filtrage de articles_clean.csv...")
-    removed = filter_csv_file(DATA_DIR / "articles_clean.csv", domain)
+    removed = filter_csv_file(data_file("articles_clean.csv"), domain)
     total_removed += removed
     print(f"   ✅ {removed} ligne(s) supprimée(s)")
     
     # 4. Filtrer scores.csv
     print("\n📄 Filtrage de scores.csv...")
-    removed = filter_csv_file(DATA_DIR / "scores.csv", domain)
+    removed = filter_csv_file(data_file("scores.csv"), domain)
     total_removed += removed
     print(f"   ✅ {removed} ligne(s) supprimée(s)")
     
@@ -4,18 +4,18 @@
 Script pour supprimer les articles publiés avant 2000 ou après 2025 des données existantes.
 """
 
+import os
 import csv
 import json
 from pathlib import Path
 from datetime import datetime
 from dateutil import parser as date_parser
 
+from filter_common import DATA_DIR, STATS_JSON_INDENT, data_file, open_csv
+
 # Augmenter la limite de taille de champ CSV
 csv.field_size_limit(50 * 1024 * 1024)  # 50MB
 
-BASE_DIR = Path(__file__).parent.parent
-DATA_DIR = BASE_DIR / "data"
-
 MIN_YEAR = 2000
 MAX_YEAR = 2025
 
@@ -36,29 +36,35 @@ def filter_csv_file(file_path: Path) -> int:
     if not file_path.exists():
         return 0
     
-    rows = []
     removed_count = 0
+    # Les lignes conservées sont écrites au fil de la lecture dans un fichier temporaire
+    tmp_path = file_path.with_name(file_path.stem + '.tmp' + file_path.suffix)
     
-    with open(file_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        fieldnames = reader.fieldnames
-        
-        for row in reader:
-            date_pub = row.get('date_pub', '')
-            
-            if is_date_invalid(date_pub):
-                removed_count += 1
-                continue
-            
-            rows.append(row)
-    
-    # Réécrire le fichier si des articles ont été supprimés
-    if removed_count > 0:
-        with open(file_path, 'w', newline='', encoding='utf-8') as f:
-            if rows and fieldnames:
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
+    try:
+        with open_csv(file_path, 'r') as f, open_csv(tmp_path, 'w') as out:
+            reader = csv.DictReader(f)
+            writer = csv.DictWriter(out, fieldnames=reader.fieldnames or [])
+            if reader.fieldnames:
                 writer.writeheader()
-                writer.writerows(rows)
+            
+            for row in reader:
+                date_pub = row.get('date_pub', '')
+                
+                if is_date_invalid(date_pub):
+                    removed_count += 1
+                    continue
+                
+                writer.writerow(row)
+        
+        # Remplacer le fichier seulement si des articles ont été supprimés
+        if removed_count > 0:
+            os.replace(tmp_path, file_path)
+        else:
+            tmp_path.unlink()
+    except BaseException:
+        # Lecture ou écriture interrompue : ne pas laisser le fichier temporaire
+        tmp_path.unlink(missing_ok=True)
+        raise
     
     return removed_count
 
@@ -100,7 +106,7 @@ def filter_json_stats(file_path: Path) -> int:
     # Sauvegarder si des articles ont été supprimés
     if removed_count > 0:
         with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+            json.dump(data, f, ensure_ascii=False, indent=STATS_JSON_INDENT)
     
     return removed_count
 
@@ -112,13 +118,13 @@ def main():
     
     # 1. Filtrer articles_clean.csv
     print("\n📄 Filtrage de articles_clean.csv...")
-    removed = filter_csv_file(DATA_DIR / "articles_clean.csv")
+    removed = filter_csv_file(data_file("articles_clean.csv"))
     total_removed += removed
     print(f"   ✅ {removed} article(s) supprimé(s)")
     
     # 2. Filtrer scores.csv
     print("\n📄 Filtrage de scores.csv...")
-    removed = filter_csv_file(DATA_DIR / "scores.csv")
+    removed = filter_csv_file(data_file("scores.csv"))
     total_removed += removed
     print(f"   ✅ {removed} score(s) supprimé(s)")
     
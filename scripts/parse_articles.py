@@ -9,12 +9,22 @@ import os
 import sys
 import csv
 import re
+import multiprocessing as mp
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Optional
-from bs4 import BeautifulSoup
+from functools import lru_cache
+from typing import Dict, Iterator, Optional, Tuple
+from urllib.parse import urlparse
+from bs4 import BeautifulSoup, SoupStrainer, NavigableString, CData
 from dateutil import parser as date_parser
 
+# pyarrow permet de lire la seule colonne url d'articles_clean.csv sans construire le texte
+try:
+    from pyarrow import csv as pa_csv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
 # Augmenter la limite de taille de champ CSV (défaut: 131072)
 # Certains articles peuvent avoir des textes très longs
 # Utiliser 50MB au lieu de sys.maxsize pour éviter l'erreur sur Windows
@@ -22,6 +32,111 @@ csv.field_size_limit(50 * 1024 * 1024)  # 50MB
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+# Expressions régulières compilées une seule fois pour tous les articles
+_RE_DATE = re.compile(r'date', re.I)
+_RE_DATE_TIME = re.compile(r'date|time', re.I)
+_RE_ARTICLE_TITLE = re.compile(r'article|title|headline', re.I)
+_RE_ARTICLE = re.compile(r'article', re.I)
+_RE_ARTICLE_CONTENT = re.compile(r'article|content', re.I)
+_RE_ARTICLE_CONTENT_POST = re.compile(r'article|content|post|text', re.I)
+_RE_F24_BODY = re.compile(r'article-content|article-body|article-text|content-body', re.I)
+_RE_F24_BODY_BEM = re.compile(r'article__content|article__body', re.I)
+_RE_DESCRIPTION = re.compile(r'description', re.I)
+_RE_MENU = re.compile(r'^(accueil|menu|navigation|recherche|connexion|inscription|partager|suivre|abonner)', re.I)
+_RE_SENTENCE_SPLIT = re.compile(r'[.!?]\s+')
+_RE_WS = re.compile(r'\s+')
+# Pages de blocage, cherchées dans les octets bruts (UTF-8 ou latin-1, toutes casses)
+_RE_BLOCKED = re.compile(
+    rb'access denied|access forbidden'
+    rb'|acc(?:\xc3\xa8|\xc3\x88|\xe8|\xc8)s refus(?:\xc3\xa9|\xc3\x89|\xe9|\xc9)',
+    re.IGNORECASE
+)
+# Les bannières de blocage apparaissent dans les premiers octets de la page
+_BLOCKED_SCAN_BYTES = 8192
+# Une seule alternance : le texte n'est parcouru qu'une fois
+_DATE_SCAN_RE = re.compile(
+    r'\d{1,2}[/-]\d{1,2}[/-]\d{4}'
+    r'|\d{4}[/-]\d{1,2}[/-]\d{1,2}'
+    r'|\d{1,2}\s+\w+\s+\d{4}'
+)
+
+# Seules ces balises (et leur contenu) sont matérialisées : scripts, styles et
+# liens de l'en-tête ne sont jamais construits dans l'arbre
+_CONTENT_STRAINER = SoupStrainer([
+    'article', 'main', 'div', 'section', 'p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    'li', 'meta', 'time', 'title', 'body',
+])
+
+# Balises de bloc délimitant les fragments de texte d'un article
+_TEXT_BLOCK_TAGS = frozenset(['p', 'div', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'li'])
+# Types de chaînes retenus par get_text() (exclut commentaires et scripts)
+_TEXT_STRING_TYPES = (NavigableString, CData)
+
+# Balises communes pour les dates de publication (ordre de priorité)
+_DEFAULT_DATE_SELECTORS = (
+    ('meta', {'property': 'article:published_time'}),
+    ('meta', {'property': 'og:published_time'}),
+    ('meta', {'property': 'article:published'}),
+    ('meta', {'name': 'publication-date'}),
+    ('meta', {'name': 'date'}),
+    ('meta', {'name': 'publishdate'}),
+    ('meta', {'name': 'DC.date'}),
+    ('meta', {'name': 'DC.Date'}),
+    ('meta', {'itemprop': 'datePublished'}),
+    ('time', {'datetime': True}),
+    ('time', {'itemprop': 'datePublished'}),
+)
+
+# Sélecteurs de date spécifiques, placés devant les sélecteurs communs
+DATE_SELECTORS_BY_DOMAIN = {
+    'lemonde.fr': (
+        ('meta', {'property': 'article:published_time'}),
+        ('time', {'class': _RE_DATE}),
+    ) + _DEFAULT_DATE_SELECTORS,
+    'france24.com': (
+        ('meta', {'property': 'article:published_time'}),
+        ('time', {'class': _RE_DATE_TIME}),
+    ) + _DEFAULT_DATE_SELECTORS,
+    'lefigaro.fr': (
+        ('meta', {'property': 'article:published_time'}),
+    ) + _DEFAULT_DATE_SELECTORS,
+    'liberation.fr': (
+        ('meta', {'property': 'article:published_time'}),
+        ('time', {'class': _RE_DATE}),
+    ) + _DEFAULT_DATE_SELECTORS,
+}
+
+# Sélecteurs génériques du conteneur principal de l'article
+_DEFAULT_CONTENT_SELECTORS = (
+    ('article', {}),
+    ('div', {'class': _RE_ARTICLE_CONTENT_POST}),
+    ('main', {}),
+    ('div', {'id': _RE_ARTICLE_CONTENT_POST}),
+)
+
+CONTENT_SELECTORS_BY_DOMAIN = {
+    'france24.com': (
+        ('article', {'class': _RE_ARTICLE_CONTENT}),
+        ('div', {'class': _RE_F24_BODY}),
+        ('div', {'class': _RE_F24_BODY_BEM}),
+        ('section', {'class': _RE_ARTICLE_CONTENT}),
+        ('div', {'data-module': _RE_ARTICLE}),
+        ('article', {}),
+        ('main', {}),
+    ),
+}
+
+
+def _site_key(domain: str) -> str:
+    """Domaine enregistré servant de clé aux tables de sélecteurs (m.lemonde.fr -> lemonde.fr)."""
+    return '.'.join(domain.rsplit('.', 2)[-2:])
+
+
+@lru_cache(maxsize=4096)
+def _parse_date_cached(date_str: str) -> datetime:
+    """date_parser.parse(fuzzy=True) mémorisé : les mêmes chaînes de date reviennent souvent."""
+    return date_parser.parse(date_str, fuzzy=True)
+
 
 class ArticleParser:
     """Parse les articles HTML et extrait le contenu textuel."""
@@ -31,63 +146,47 @@ class ArticleParser:
         self.data_dir = self.base_dir / "data"
         self.raw_html_dir = self.data_dir / "raw_html"
         self.articles_file = self.data_dir / "articles_clean.csv"
+        # Index des URLs déjà écrites dans articles_clean.csv (une par ligne)
+        self.parsed_index_file = self.data_dir / "articles_parsed.idx"
         
         self.fetch_log_file = self.data_dir / "fetch_log.csv"
     
-    def _load_fetch_log(self) -> Dict[str, str]:
-        """Charge le log des téléchargements pour obtenir les chemins des fichiers."""
-        log = {}
-        if self.fetch_log_file.exists():
-            with open(self.fetch_log_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    if row['status'] == 'success':
-                        log[row['url']] = row['file_path']
-        return log
+    def _iter_fetch_log(self) -> Iterator[Tuple[str, str]]:
+        """Parcourt le log des téléchargements réussis : (url, chemin du fichier HTML)."""
+        if not self.fetch_log_file.exists():
+            return
+        with open(self.fetch_log_file, 'r', encoding='utf-8') as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if not header:
+                return
+            url_i = header.index('url')
+            status_i = header.index('status')
+            path_i = header.index('file_path')
+            min_len = max(url_i, status_i, path_i) + 1
+            for row in reader:
+                # Lignes vides ou tronquées ignorées (comme le faisait DictReader)
+                if len(row) < min_len:
+                    continue
+                if row[status_i] == 'success':
+                    yield row[url_i], row[path_i]
     
-    def _extract_date_from_meta(self, soup: BeautifulSoup, url: str = "") -> Optional[str]:
-        """Extrait la date de publication depuis les balises meta."""
-        # Détecter le domaine pour utiliser des sélecteurs spécifiques
-        domain = ""
-        if url:
-            from urllib.parse import urlparse
-            parsed = urlparse(url)
-            domain = parsed.netloc.replace("www.", "").lower()
-        
-        # Balises meta communes pour les dates (ordre de priorité)
-        date_selectors = [
-            ('meta', {'property': 'article:published_time'}),
-            ('meta', {'property': 'og:published_time'}),
-            ('meta', {'property': 'article:published'}),
-            ('meta', {'name': 'publication-date'}),
-            ('meta', {'name': 'date'}),
-            ('meta', {'name': 'publishdate'}),
-            ('meta', {'name': 'DC.date'}),
-            ('meta', {'name': 'DC.Date'}),
-            ('meta', {'itemprop': 'datePublished'}),
-            ('time', {'datetime': True}),
-            ('time', {'itemprop': 'datePublished'}),
-        ]
+    def _extract_date_from_meta(self, soup: BeautifulSoup, domain: str = "") -> Optional[str]:
+        """Extrait la date de publication depuis les balises meta (domain en minuscules, sans www.)."""
+        date_selectors = DATE_SELECTORS_BY_DOMAIN.get(_site_key(domain), _DEFAULT_DATE_SELECTORS)
         
-        # Sélecteurs spécifiques par domaine
-        if 'lemonde.fr' in domain:
-            date_selectors.insert(0, ('meta', {'property': 'article:published_time'}))
-            date_selectors.insert(1, ('time', {'class': re.compile(r'date', re.I)}))
-        elif 'france24.com' in domain:
-            date_selectors.insert(0, ('meta', {'property': 'article:published_time'}))
-            date_selectors.insert(1, ('time', {'class': re.compile(r'date|time', re.I)}))
-        elif 'lefigaro.fr' in domain:
-            date_selectors.insert(0, ('meta', {'property': 'article:published_time'}))
-        elif 'liberation.fr' in domain:
-            date_selectors.insert(0, ('meta', {'property': 'article:published_time'}))
-            date_selectors.insert(1, ('time', {'class': re.compile(r'date', re.I)}))
+        # Un seul parcours de l'arbre pour toutes les balises meta (le SoupStrainer
+        # ne conserve pas <head> : les meta de l'en-tête sont à la racine)
+        meta_tags = soup.find_all('meta')
+        # Les balises time ne se trouvent que dans le corps de la page
+        time_scope = soup.body or soup
         
         for tag_name, attrs in date_selectors:
             if tag_name == 'time':
                 # Chercher toutes les balises time avec datetime
-                time_tags = soup.find_all('time', attrs={'datetime': True})
+                time_tags = time_scope.find_all('time', attrs={'datetime': True})
                 if not time_tags:
-                    time_tags = soup.find_all('time', attrs)
+                    time_tags = time_scope.find_all('time', attrs)
                 for time_tag in time_tags:
                     datetime_attr = time_tag.get('datetime')
                     if datetime_attr:
@@ -96,18 +195,22 @@ class ArticleParser:
                     text = time_tag.get_text(strip=True)
                     if text:
                         try:
-                            parsed_date = date_parser.parse(text, fuzzy=True)
+                            parsed_date = _parse_date_cached(text)
                             return parsed_date.isoformat()
                         except:
                             pass
             else:
-                meta_tag = soup.find(tag_name, attrs)
+                meta_tag = next(
+                    (tag for tag in meta_tags
+                     if all(tag.get(key) == value for key, value in attrs.items())),
+                    None
+                )
                 if meta_tag:
                     content = meta_tag.get('content') or meta_tag.get('datetime')
                     if content:
                         # Nettoyer et normaliser la date
                         try:
-                            parsed_date = date_parser.parse(content, fuzzy=True)
+                            parsed_date = _parse_date_cached(content)
                             return parsed_date.isoformat()
                         except:
                             return content
@@ -117,23 +220,13 @@ class ArticleParser:
     def _extract_date_from_text(self, soup: BeautifulSoup) -> Optional[str]:
         """Tente d'extraire la date depuis le texte de la page."""
         # Chercher des patterns de date dans le texte
-        date_patterns = [
-            r'\d{1,2}[/-]\d{1,2}[/-]\d{4}',
-            r'\d{4}[/-]\d{1,2}[/-]\d{1,2}',
-            r'\d{1,2}\s+\w+\s+\d{4}',
-        ]
-        
         text = soup.get_text()
-        for pattern in date_patterns:
-            matches = re.findall(pattern, text)
-            if matches:
-                try:
-                    # Essayer de parser la première date trouvée
-                    date_str = matches[0]
-                    parsed_date = date_parser.parse(date_str, fuzzy=True)
-                    return parsed_date.isoformat()
-                except:
-                    pass
+        for match in _DATE_SCAN_RE.finditer(text):
+            try:
+                # S'arrêter à la première date parsable
+                return _parse_date_cached(match.group()).isoformat()
+            except:
+                pass
         
         return None
     
@@ -141,7 +234,7 @@ class ArticleParser:
         """Extrait le titre de l'article."""
         # Ordre de priorité pour le titre
         title_selectors = [
-            ('h1', {'class': re.compile(r'article|title|headline', re.I)}),
+            ('h1', {'class': _RE_ARTICLE_TITLE}),
             ('meta', {'property': 'og:title'}),
             ('meta', {'name': 'title'}),
             ('title', {}),
@@ -161,35 +254,9 @@ class ArticleParser:
         
         return ""
     
-    def _extract_text(self, soup: BeautifulSoup, url: str = "") -> str:
-        """Extrait le texte principal de l'article."""
-        # Détecter le domaine pour utiliser des sélecteurs spécifiques
-        domain = ""
-        if url:
-            from urllib.parse import urlparse
-            parsed = urlparse(url)
-            domain = parsed.netloc.replace("www.", "").lower()
-        
-        # Sélecteurs spécifiques par domaine
-        if 'france24.com' in domain:
-            # Sélecteurs spécifiques pour France 24
-            content_selectors = [
-                ('article', {'class': re.compile(r'article|content', re.I)}),
-                ('div', {'class': re.compile(r'article-content|article-body|article-text|content-body', re.I)}),
-                ('div', {'class': re.compile(r'article__content|article__body', re.I)}),
-                ('section', {'class': re.compile(r'article|content', re.I)}),
-                ('div', {'data-module': re.compile(r'article', re.I)}),
-                ('article', {}),
-                ('main', {}),
-            ]
-        else:
-            # Sélecteurs génériques pour les autres sites
-            content_selectors = [
-                ('article', {}),
-                ('div', {'class': re.compile(r'article|content|post|text', re.I)}),
-                ('main', {}),
-                ('div', {'id': re.compile(r'article|content|post|text', re.I)}),
-            ]
+    def _extract_text(self, soup: BeautifulSoup, domain: str = "") -> str:
+        """Extrait le texte principal de l'article (domain en minuscules, sans www.)."""
+        content_selectors = CONTENT_SELECTORS_BY_DOMAIN.get(_site_key(domain), _DEFAULT_CONTENT_SELECTORS)
         
         content_element = None
         for tag_name, attrs in content_selectors:
@@ -202,25 +269,40 @@ class ArticleParser:
             # Fallback: prendre le body entier
             content_element = soup.find('body') or soup
         
-        # Extraire tous les paragraphes et autres éléments de texte
-        text_elements = content_element.find_all(['p', 'div', 'span', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'li'], recursive=True)
-        text_parts = []
-        seen_texts = set()  # Éviter les doublons
-        
-        for elem in text_elements:
-            text = elem.get_text(strip=True)
-            # Filtrer les éléments trop courts (probablement du menu/nav)
-            # Réduire le seuil à 30 caractères pour capturer plus de contenu
-            if len(text) > 30 and text not in seen_texts:
-                # Filtrer les textes qui ressemblent à des menus/navigation
-                if not re.match(r'^(accueil|menu|navigation|recherche|connexion|inscription|partager|suivre|abonner)', text, re.I):
-                    text_parts.append(text)
-                    seen_texts.add(text)
+        # Un seul parcours des chaînes : chacune est rattachée à son bloc le plus
+        # proche, au lieu d'un get_text() par élément imbriqué (qui revisitait
+        # les descendants et produisait des doublons)
+        blocks: Dict[int, list] = {}
+        # Les chaînes sœurs partagent le même parent : la remontée vers le bloc
+        # n'est faite qu'une fois par parent
+        block_of: Dict[int, list] = {}
+        string_types = _TEXT_STRING_TYPES
+        for node in content_element.descendants:
+            if type(node) not in string_types:
+                continue
+            parent = node.parent
+            strings = block_of.get(id(parent))
+            if strings is None:
+                block = parent
+                while block is not content_element and block.name not in _TEXT_BLOCK_TAGS:
+                    block = block.parent
+                strings = blocks.setdefault(id(block), [])
+                block_of[id(parent)] = strings
+            strings.append(node)
+        
+        block_texts = (' '.join(''.join(strings).split()) for strings in blocks.values())
+        # Filtrer les blocs trop courts (probablement du menu/nav) et ceux qui
+        # ressemblent à des menus/navigation ; dédoublonner en gardant l'ordre
+        text_parts = list(dict.fromkeys(
+            text for text in block_texts
+            if len(text) > 30 and not _RE_MENU.match(text)
+        ))
+        seen_texts = set(text_parts)
         
         # Si toujours pas de texte, essayer d'extraire directement depuis le body
         if not text_parts or len('\n\n'.join(text_parts)) < 50:
             # Essayer d'extraire depuis les balises meta description
-            meta_desc = soup.find('meta', {'name': re.compile(r'description', re.I)})
+            meta_desc = soup.find('meta', {'name': _RE_DESCRIPTION})
             if meta_desc and meta_desc.get('content'):
                 text_parts.insert(0, meta_desc.get('content'))
             
@@ -229,7 +311,7 @@ class ArticleParser:
             if body_text:
                 full_text = body_text.get_text(separator=' ', strip=True)
                 # Nettoyer et diviser en phrases
-                sentences = re.split(r'[.!?]\s+', full_text)
+                sentences = _RE_SENTENCE_SPLIT.split(full_text)
                 for sentence in sentences:
                     sentence = sentence.strip()
                     if len(sentence) > 50 and sentence not in seen_texts:
@@ -238,41 +320,117 @@ class ArticleParser:
         
         return '\n\n'.join(text_parts)
     
+    def _index_header(self) -> str:
+        """
+        En-tête de l'index : taille et mtime actuels d'articles_clean.csv.
+        Largeur fixe pour pouvoir le réécrire sur place en fin de parsing.
+        """
+        try:
+            st = self.articles_file.stat()
+            size, mtime_ns = st.st_size, st.st_mtime_ns
+        except FileNotFoundError:
+            size, mtime_ns = 0, 0
+        return f"#csv size={size:020d} mtime_ns={mtime_ns:020d}\n"
+    
+    def _stamp_parsed_index(self):
+        """Enregistre dans l'index l'état d'articles_clean.csv qu'il décrit."""
+        with open(self.parsed_index_file, 'r+', encoding='utf-8') as f:
+            f.write(self._index_header())
+    
+    def _load_parsed_urls(self) -> set:
+        """Charge les URLs déjà présentes dans articles_clean.csv."""
+        if not self.articles_file.exists():
+            return set()
+        
+        # Index léger : évite de relire tout le texte des articles. Il n'est utilisé
+        # que si articles_clean.csv n'a pas changé depuis (filtres, dédoublonnage,
+        # édition manuelle, arrêt en cours de parsing) ; sinon il est reconstruit.
+        if self.parsed_index_file.exists():
+            with open(self.parsed_index_file, 'r', encoding='utf-8') as f:
+                header = f.readline()
+                if header == self._index_header():
+                    return set(f.read().splitlines())
+            print("⚠️  Index des articles parsés obsolète, reconstruction...")
+        
+        parsed_urls = self._scan_parsed_urls()
+        # Créer l'index pour les prochains lancements
+        with open(self.parsed_index_file, 'w', encoding='utf-8') as f:
+            f.write(self._index_header())
+            f.writelines(url + '\n' for url in parsed_urls)
+        return parsed_urls
+    
+    def _scan_parsed_urls(self) -> set:
+        """Lit la colonne url d'articles_clean.csv (utilisé quand l'index n'existe pas)."""
+        if PYARROW_AVAILABLE:
+            # Lecteur CSV en C qui ne convertit que la colonne url
+            table = pa_csv.read_csv(
+                self.articles_file,
+                read_options=pa_csv.ReadOptions(block_size=64 * 1024 * 1024),
+                parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+                convert_options=pa_csv.ConvertOptions(
+                    include_columns=['url'],
+                    column_types={'url': 'string'},
+                ),
+            )
+            return set(table.column('url').to_pylist())
+        
+        parsed_urls = set()
+        with open(self.articles_file, 'r', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                parsed_urls.add(row['url'])
+        return parsed_urls
+    
+    def _make_soup(self, content: str) -> BeautifulSoup:
+        """Construit l'arbre HTML avec lxml (parseur C), html.parser en secours."""
+        try:
+            return BeautifulSoup(content, 'lxml', parse_only=_CONTENT_STRAINER)
+        except Exception:
+            # lxml absent (FeatureNotFound) ou document qu'il refuse
+            return BeautifulSoup(content, 'html.parser', parse_only=_CONTENT_STRAINER)
+    
     def parse_html_file(self, html_path: Path, url: str) -> Optional[Dict]:
         """Parse un fichier HTML et retourne les données extraites."""
         try:
-            with open(html_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except UnicodeDecodeError:
-            # Essayer avec d'autres encodages
-            try:
-                with open(html_path, 'r', encoding='latin-1') as f:
-                    content = f.read()
-            except:
-                print(f"    ⚠️  Erreur d'encodage: {html_path}")
-                return None
+            with open(html_path, 'rb') as f:
+                content_bytes = f.read()
+        except FileNotFoundError:
+            return None
+        except OSError:
+            print(f"    ⚠️  Erreur de lecture: {html_path}")
+            return None
         
         # Vérifier si le contenu contient "Access Denied" ou des erreurs de blocage
-        content_lower = content.lower()
-        if 'access denied' in content_lower or 'accès refusé' in content_lower or 'access forbidden' in content_lower:
+        # (une seule recherche, sans copie en minuscules de toute la page)
+        if _RE_BLOCKED.search(content_bytes, 0, _BLOCKED_SCAN_BYTES):
             print(f"    ⏭️  Access Denied détecté, article ignoré: {url}")
             return None
         
-        soup = BeautifulSoup(content, 'html.parser')
+        try:
+            content = content_bytes.decode('utf-8')
+        except UnicodeDecodeError:
+            # Essayer avec d'autres encodages
+            content = content_bytes.decode('latin-1')
+        
+        soup = self._make_soup(content)
+        
+        # Analyser l'URL une seule fois pour tous les extracteurs
+        domain = self._extract_domain(url)
+        selector_domain = domain.lower()
         
         # Extraire les données
         title = self._extract_title(soup)
-        text = self._extract_text(soup, url)
+        text = self._extract_text(soup, selector_domain)
         
         # Extraire la date
-        date_pub = self._extract_date_from_meta(soup, url)
+        date_pub = self._extract_date_from_meta(soup, selector_domain)
         if not date_pub:
             date_pub = self._extract_date_from_text(soup)
         
         # Normaliser la date si elle existe et filtrer les articles avant 2000 ou après 2025
         if date_pub:
             try:
-                parsed_date = date_parser.parse(date_pub, fuzzy=True)
+                parsed_date = _parse_date_cached(date_pub)
                 year = parsed_date.year
                 # Filtrer les articles publiés avant 2000 ou après 2025
                 if year < 2000:
@@ -288,7 +446,7 @@ class ArticleParser:
                 pass
         
         # Nettoyer le texte
-        text = re.sub(r'\s+', ' ', text)  # Normaliser les espaces
+        text = _RE_WS.sub(' ', text)  # Normaliser les espaces
         text = text.strip()
         
         # Réduire le seuil minimum à 50 caractères pour capturer plus d'articles
@@ -297,8 +455,7 @@ class ArticleParser:
             print(f"    ⚠️  Texte trop court ou vide: {url}")
             return None
         
-        # Extraire le domaine et filtrer franceculture.fr
-        domain = self._extract_domain(url)
+        # Filtrer franceculture.fr
         if domain == 'franceculture.fr' or 'franceculture.fr' in domain:
             print(f"    ⏭️  Article de franceculture.fr exclu: {url}")
             return None
@@ -315,7 +472,6 @@ class ArticleParser:
     
     def _extract_domain(self, url: str) -> str:
         """Extrait le domaine d'une URL."""
-        from urllib.parse import urlparse
         try:
             parsed = urlparse(url)
             return parsed.netloc.replace("www.", "")
@@ -326,60 +482,80 @@ class ArticleParser:
         """Parse tous les articles téléchargés."""
         print("📄 Début du parsing des articles...")
         
-        # Charger le log des téléchargements
-        fetch_log = self._load_fetch_log()
+        # Charger les articles déjà parsés
+        parsed_urls = self._load_parsed_urls()
+        
+        # Parcourir le log des téléchargements et garder les articles restant à parser
+        # (l'existence des fichiers est vérifiée à l'ouverture par parse_html_file)
+        has_fetched = False
+        tasks = []
+        for url, file_path in self._iter_fetch_log():
+            has_fetched = True
+            if url in parsed_urls:
+                continue
+            parsed_urls.add(url)  # Une URL téléchargée plusieurs fois n'est parsée qu'une fois
+            tasks.append((self.base_dir / file_path, url))
         
-        if not fetch_log:
+        if not has_fetched:
             print("❌ Aucun article téléchargé trouvé")
             return
         
-        # Charger les articles déjà parsés
-        parsed_urls = set()
-        if self.articles_file.exists():
-            with open(self.articles_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    parsed_urls.add(row['url'])
-        
-        # Parser les nouveaux articles
+        # Parser les nouveaux articles en parallèle, écrits au fil de l'eau
         file_exists = self.articles_file.exists()
-        new_articles = []
+        new_count = 0
+        total = len(tasks)
         
-        total = len(fetch_log)
-        current = 0
+        # Un index sans articles_clean.csv est obsolète : le recréer
+        index_mode = 'a' if file_exists else 'w'
         
-        for url, file_path in fetch_log.items():
-            current += 1
+        with open(self.articles_file, 'a', newline='', encoding='utf-8') as f, \
+                open(self.parsed_index_file, index_mode, encoding='utf-8') as idx_f:
+            fieldnames = ['url', 'domain', 'title', 'date_pub', 'text', 'text_length', 'parse_date']
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
             
-            if url in parsed_urls:
-                continue
+            if not file_exists:
+                writer.writeheader()
+            if index_mode == 'w':
+                # En-tête provisoire : réécrit par _stamp_parsed_index en fin de parsing
+                idx_f.write(self._index_header())
             
-            html_path = self.base_dir / file_path
-            if not html_path.exists():
-                continue
-            
-            print(f"[{current}/{total}] Parsing: {url[:60]}...")
-            article_data = self.parse_html_file(html_path, url)
-            
-            if article_data:
-                new_articles.append(article_data)
-        
-        # Sauvegarder les nouveaux articles
-        if new_articles:
-            with open(self.articles_file, 'a', newline='', encoding='utf-8') as f:
-                fieldnames = ['url', 'domain', 'title', 'date_pub', 'text', 'text_length', 'parse_date']
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                
-                if not file_exists:
-                    writer.writeheader()
-                
-                writer.writerows(new_articles)
-            
-            print(f"\n✅ Parsing terminé: {len(new_articles)} nouveaux articles parsés")
+            if tasks:
+                with mp.Pool(processes=os.cpu_count()) as pool:
+                    results = pool.imap_unordered(_parse_one, tasks, chunksize=16)
+                    for current, (url, article_data) in enumerate(results, 1):
+                        print(f"[{current}/{total}] Parsing: {url[:60]}...")
+                        
+                        if article_data:
+                            # Écrire immédiatement : un arrêt en cours de route ne perd rien
+                            writer.writerow(article_data)
+                            f.flush()
+                            idx_f.write(url + '\n')
+                            idx_f.flush()
+                            new_count += 1
+        
+        # CSV complet et fermé : l'index le décrit. Un arrêt avant ce point laisse
+        # un en-tête périmé, et l'index sera reconstruit au prochain lancement.
+        self._stamp_parsed_index()
+        
+        if new_count:
+            print(f"\n✅ Parsing terminé: {new_count} nouveaux articles parsés")
         else:
             print("\n✅ Tous les articles ont déjà été parsés")
 
 
+# Parseur propre à chaque processus de travail (créé à la première tâche)
+_worker_parser: Optional[ArticleParser] = None
+
+
+def _parse_one(task: Tuple[Path, str]) -> Tuple[str, Optional[Dict]]:
+    """Parse un article dans un processus du pool ; task = (chemin HTML, url)."""
+    global _worker_parser
+    if _worker_parser is None:
+        _worker_parser = ArticleParser()
+    html_path, url = task
+    return url, _worker_parser.parse_html_file(html_path, url)
+
+
 def main():
     parser = ArticleParser()
     parser.parse_all()
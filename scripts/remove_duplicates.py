@@ -5,11 +5,20 @@ Script pour détecter et supprimer les doublons dans les fichiers de données.
 Vérifie les URLs en double dans tous les fichiers CSV.
 """
 
+import os
+import re
 import csv
 import json
+import pandas as pd
 from pathlib import Path
-from collections import defaultdict
-from typing import Dict, List, Set
+from typing import Dict
+
+# orjson (Rust) lit et écrit le JSON bien plus vite que le module json standard
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Augmenter la limite de taille de champ CSV
 csv.field_size_limit(50 * 1024 * 1024)  # 50MB
@@ -17,103 +26,77 @@ csv.field_size_limit(50 * 1024 * 1024)  # 50MB
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / "data"
 
+# Fragment/paramètres en fin d'URL et slash final qui les précède éventuellement
+_NORMALIZE_RE = re.compile(r'/?(?:[#?].*)?$')
+
 def normalize_url(url: str) -> str:
     """Normalise une URL pour la comparaison."""
     if not url:
         return ""
-    # Supprimer les fragments et paramètres de tracking
-    url = url.split('#')[0].split('?')[0]
-    # Supprimer le trailing slash
-    if url.endswith('/'):
-        url = url[:-1]
-    return url.lower().strip()
+    # Supprimer les fragments, paramètres de tracking et le trailing slash
+    return _NORMALIZE_RE.sub('', url).lower().strip()
 
-def remove_duplicates_from_csv(file_path: Path, key_field: str = 'url') -> Dict:
-    """Supprime les doublons d'un fichier CSV en gardant la première occurrence."""
-    if not file_path.exists():
-        return {'removed': 0, 'total': 0, 'kept': 0}
-    
-    seen_urls: Set[str] = set()
-    seen_normalized: Set[str] = set()
-    unique_rows: List[Dict] = []
-    duplicates: List[Dict] = []
-    
-    with open(file_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        fieldnames = reader.fieldnames
-        
-        if not fieldnames or key_field not in fieldnames:
-            return {'removed': 0, 'total': 0, 'kept': 0, 'error': f'Champ {key_field} non trouvé'}
-        
-        for row in reader:
-            url = row.get(key_field, '')
-            normalized = normalize_url(url)
-            
-            # Vérifier si on a déjà vu cette URL (originale ou normalisée)
-            if url in seen_urls or normalized in seen_normalized:
-                duplicates.append(row)
-                continue
-            
-            # Ajouter aux sets de tracking
-            seen_urls.add(url)
-            if normalized:
-                seen_normalized.add(normalized)
-            
-            unique_rows.append(row)
-    
-    total = len(unique_rows) + len(duplicates)
-    removed = len(duplicates)
-    
-    # Réécrire le fichier si des doublons ont été trouvés
-    if removed > 0:
-        with open(file_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(unique_rows)
-    
-    return {
-        'removed': removed,
-        'total': total,
-        'kept': len(unique_rows),
-        'duplicates': duplicates[:10]  # Garder les 10 premiers pour affichage
-    }
+def normalize_url_series(urls: pd.Series) -> pd.Series:
+    """Version vectorisée de normalize_url pour une colonne pandas."""
+    return urls.str.replace(_NORMALIZE_RE, '', regex=True).str.lower().str.strip()
 
-def analyze_duplicates_in_csv(file_path: Path, key_field: str = 'url') -> Dict:
-    """Analyse les doublons sans les supprimer."""
-    if not file_path.exists():
-        return {'duplicates': [], 'count': 0}
+def process_csv(file_path: Path, key_field: str = 'url') -> Dict:
+    """Analyse et supprime les doublons d'un fichier CSV en une seule lecture.
     
-    url_counts = defaultdict(list)
-    
-    with open(file_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        
-        for idx, row in enumerate(reader):
-            url = row.get(key_field, '')
-            normalized = normalize_url(url)
-            
-            if url:
-                url_counts[normalized].append({
-                    'index': idx + 1,
-                    'url': url,
-                    'row': row
-                })
-    
-    # Trouver les doublons
-    duplicates = []
-    for normalized_url, occurrences in url_counts.items():
-        if len(occurrences) > 1:
-            duplicates.append({
-                'url': occurrences[0]['url'],
-                'normalized': normalized_url,
-                'count': len(occurrences),
-                'occurrences': occurrences
-            })
+    Garde la première occurrence de chaque URL (originale ou normalisée) et
+    retourne le rapport des doublons avec le bilan de la suppression.
+    """
+    empty_report = {'duplicates': [], 'count': 0, 'total_duplicate_rows': 0, 'removed': 0, 'total': 0, 'kept': 0}
+    if not file_path.exists():
+        return empty_report
+    
+    # Lecture en colonnes (pandas, moteur C) plutôt qu'un dict Python par ligne
+    try:
+        df = pd.read_csv(file_path, dtype=str, keep_default_na=False)
+    except pd.errors.EmptyDataError:
+        # Fichier vide (0 octet) : aucune ligne
+        return empty_report
+    
+    if key_field not in df.columns:
+        return {**empty_report, 'error': f'Champ {key_field} non trouvé'}
+    
+    urls = df[key_field]
+    normalized = normalize_url_series(urls)
+    
+    # Rapport : URLs normalisées présentes plusieurs fois (URLs vides ignorées)
+    non_empty = urls != ''
+    counts = normalized[non_empty].value_counts(sort=False)
+    counts = counts[counts > 1]
+    first_urls = urls[non_empty].groupby(normalized[non_empty], sort=False).first()
+    duplicates = [
+        {'url': first_urls[normalized_url], 'normalized': normalized_url, 'count': int(count)}
+        for normalized_url, count in counts.items()
+    ]
+    
+    # Doublon si l'URL (originale ou normalisée) a déjà été vue
+    is_duplicate = urls.duplicated() | (normalized.duplicated() & (normalized != ''))
+    
+    total = len(df)
+    removed = int(is_duplicate.sum())
+    
+    # Réécrire le fichier si des doublons ont été trouvés (remplacement atomique)
+    if removed > 0:
+        tmp_path = file_path.with_suffix('.tmp')
+        try:
+            df[~is_duplicate].to_csv(tmp_path, index=False, encoding='utf-8')
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            # Écriture interrompue : ne pas laisser le fichier temporaire
+            tmp_path.unlink(missing_ok=True)
+            raise
     
     return {
         'duplicates': duplicates,
         'count': len(duplicates),
-        'total_duplicate_rows': sum(len(d['occurrences']) - 1 for d in duplicates)
+        'total_duplicate_rows': sum(d['count'] - 1 for d in duplicates),
+        'removed': removed,
+        'total': total,
+        'kept': total - removed,
     }
 
 def remove_duplicates_from_json(file_path: Path) -> Dict:
@@ -121,8 +104,12 @@ def remove_duplicates_from_json(file_path: Path) -> Dict:
     if not file_path.exists():
         return {'removed': 0}
     
-    with open(file_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    if ORJSON_AVAILABLE:
+        with open(file_path, 'rb') as f:
+            data = orjson.loads(f.read())
+    else:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
     
     removed = 0
     
@@ -165,8 +152,12 @@ def remove_duplicates_from_json(file_path: Path) -> Dict:
     
     # Sauvegarder si des doublons ont été supprimés
     if removed > 0:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        if ORJSON_AVAILABLE:
+            with open(file_path, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        else:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
     
     return {'removed': removed}
 
@@ -176,77 +167,36 @@ def main():
     
     total_removed = 0
     
-    # 1. Analyser urls_raw.csv
-    print("\n📄 Analyse de urls_raw.csv...")
-    file_path = DATA_DIR / "urls_raw.csv"
-    if file_path.exists():
-        analysis = analyze_duplicates_in_csv(file_path, 'url')
-        if analysis['count'] > 0:
-            print(f"   ⚠️  {analysis['count']} URL(s) en double détectée(s)")
-            print(f"   📊 {analysis['total_duplicate_rows']} ligne(s) dupliquée(s) au total")
-            
-            # Afficher quelques exemples
-            for dup in analysis['duplicates'][:5]:
-                print(f"      - {dup['url'][:60]}... ({dup['count']} occurrences)")
-            
-            result = remove_duplicates_from_csv(file_path, 'url')
-            total_removed += result['removed']
-            print(f"   ✅ {result['removed']} doublon(s) supprimé(s), {result['kept']} ligne(s) conservée(s)")
-        else:
-            print(f"   ✅ Aucun doublon trouvé")
-    else:
-        print(f"   ⏭️  Fichier non trouvé")
-    
-    # 2. Analyser urls_clean.csv
-    print("\n📄 Analyse de urls_clean.csv...")
-    file_path = DATA_DIR / "urls_clean.csv"
-    if file_path.exists():
-        analysis = analyze_duplicates_in_csv(file_path, 'url')
-        if analysis['count'] > 0:
-            print(f"   ⚠️  {analysis['count']} URL(s) en double détectée(s)")
-            print(f"   📊 {analysis['total_duplicate_rows']} ligne(s) dupliquée(s) au total")
-            
-            result = remove_duplicates_from_csv(file_path, 'url')
-            total_removed += result['removed']
-            print(f"   ✅ {result['removed']} doublon(s) supprimé(s), {result['kept']} ligne(s) conservée(s)")
-        else:
-            print(f"   ✅ Aucun doublon trouvé")
-    else:
-        print(f"   ⏭️  Fichier non trouvé")
-    
-    # 3. Analyser articles_clean.csv
-    print("\n📄 Analyse de articles_clean.csv...")
-    file_path = DATA_DIR / "articles_clean.csv"
-    if file_path.exists():
-        analysis = analyze_duplicates_in_csv(file_path, 'url')
-        if analysis['count'] > 0:
-            print(f"   ⚠️  {analysis['count']} article(s) en double détecté(s)")
-            print(f"   📊 {analysis['total_duplicate_rows']} ligne(s) dupliquée(s) au total")
-            
-            result = remove_duplicates_from_csv(file_path, 'url')
-            total_removed += result['removed']
-            print(f"   ✅ {result['removed']} doublon(s) supprimé(s), {result['kept']} article(s) conservé(s)")
-        else:
-            print(f"   ✅ Aucun doublon trouvé")
-    else:
-        print(f"   ⏭️  Fichier non trouvé")
-    
-    # 4. Analyser scores.csv
-    print("\n📄 Analyse de scores.csv...")
-    file_path = DATA_DIR / "scores.csv"
-    if file_path.exists():
-        analysis = analyze_duplicates_in_csv(file_path, 'url')
-        if analysis['count'] > 0:
-            print(f"   ⚠️  {analysis['count']} score(s) en double détecté(s)")
-            print(f"   📊 {analysis['total_duplicate_rows']} ligne(s) dupliquée(s) au total")
+    # 1-4. Analyser les fichiers CSV : (fichier, libellé des doublons, libellé des lignes conservées)
+    csv_files = [
+        ("urls_raw.csv", "URL(s) en double détectée(s)", "ligne(s) conservée(s)"),
+        ("urls_clean.csv", "URL(s) en double détectée(s)", "ligne(s) conservée(s)"),
+        ("articles_clean.csv", "article(s) en double détecté(s)", "article(s) conservé(s)"),
+        ("scores.csv", "score(s) en double détecté(s)", "score(s) conservé(s)"),
+    ]
+    
+    for file_name, duplicates_label, kept_label in csv_files:
+        print(f"\n📄 Analyse de {file_name}...")
+        file_path = DATA_DIR / file_name
+        if not file_path.exists():
+            print(f"   ⏭️  Fichier non trouvé")
+            continue
+        
+        result = process_csv(file_path, 'url')
+        if result['count'] > 0:
+            print(f"   ⚠️  {result['count']} {duplicates_label}")
+            print(f"   📊 {result['total_duplicate_rows']} ligne(s) dupliquée(s) au total")
             
-            result = remove_duplicates_from_csv(file_path, 'url')
+            if file_name == "urls_raw.csv":
+                # Afficher quelques exemples
+                for dup in result['duplicates'][:5]:
+                    print(f"      - {dup['url'][:60]}... ({dup['count']} occurrences)")
+        
+        if result['removed'] > 0:
             total_removed += result['removed']
-            print(f"   ✅ {result['removed']} doublon(s) supprimé(s), {result['kept']} score(s) conservé(s)")
+            print(f"   ✅ {result['removed']} doublon(s) supprimé(s), {result['kept']} {kept_label}")
         else:
             print(f"   ✅ Aucun doublon trouvé")
-    else:
-        print(f"   ⏭️  Fichier non trouvé")
     
     # 5. Analyser stats_daily.json
     print("\n📄 Analyse de stats_daily.json...")
@@ -9,10 +9,22 @@ import os
 import sys
 from pathlib import Path
 import shutil
+import threading
+import time
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 
+def _remove_dir_fast(dir_path: Path) -> threading.Thread:
+    """Renomme le dossier (instantané) puis le supprime dans un thread en arrière-plan."""
+    trash_path = dir_path.with_name(f"{dir_path.name}.trash-{int(time.time())}")
+    dir_path.rename(trash_path)
+    # Thread non-daemon : le processus attend la fin de la suppression avant de quitter
+    thread = threading.Thread(target=shutil.rmtree, args=(trash_path,), kwargs={'ignore_errors': True})
+    thread.start()
+    return thread
+
+
 def reset_data():
     """Réinitialise toutes les données du projet."""
     base_dir = Path(__file__).parent.parent
@@ -25,7 +37,9 @@ def reset_data():
         "articles_clean.csv",
         "scores.csv",
         "stats_daily.csv",
-        "fetch_log.csv"
+        "fetch_log.csv",
+        "articles_parsed.idx",
+        ".pipeline_state.json"
     ]
     
     # Dossiers à supprimer
@@ -46,19 +60,22 @@ def reset_data():
         else:
             print(f"   ⏭️  Non trouvé: {csv_file}")
     
-    # Supprimer les dossiers
+    # Supprimer les dossiers (raw_html/ peut contenir des centaines de milliers de fichiers)
     print("\n📁 Suppression des dossiers...")
+    for leftover in data_dir.glob("*.trash-*"):
+        # Restes d'une réinitialisation interrompue
+        _remove_dir_fast(leftover)
     for dir_name in directories:
         dir_path = data_dir / dir_name
         if dir_path.exists():
-            shutil.rmtree(dir_path)
-            print(f"   ✅ Supprimé: {dir_name}/")
+            _remove_dir_fast(dir_path)
+            print(f"   ✅ Supprimé: {dir_name}/ (nettoyage du disque en arrière-plan)")
         else:
             print(f"   ⏭️  Non trouvé: {dir_name}/")
     
     # Recréer les dossiers nécessaires
     print("\n📁 Recréation des dossiers...")
-    (data_dir / "raw_html").mkdir(exist_ok=True)
+    (data_dir / "raw_html").mkdir(parents=True, exist_ok=True)
     print("   ✅ Dossier raw_html/ créé")
     
     print("\n" + "=" * 60)
@@ -2,19 +2,133 @@
 # -*- coding: utf-8 -*-
 """
 Script d'orchestration pour exécuter le pipeline complet.
-Exécute tous les scripts dans l'ordre.
+Exécute tous les scripts dans l'ordre, dans le même processus par défaut
+(--isolated pour relancer un interpréteur par étape).
 """
 
 import sys
+import json
+import hashlib
+import importlib
+import traceback
 import subprocess
 from pathlib import Path
+from typing import Dict, Optional
 
 BASE_DIR = Path(__file__).parent.parent
 SCRIPTS_DIR = BASE_DIR / "scripts"
+STATE_FILE = BASE_DIR / "data" / ".pipeline_state.json"
+
+# Entrées et sorties de chaque étape (relatives à BASE_DIR), pour --skip-existing.
+# La collecte d'URLs dépend des résultats de recherche du jour : jamais sautée.
+STAGE_FILES = {
+    "fetch_articles": (["config/medias.yml", "data/urls_clean.csv"], ["data/fetch_log.csv"]),
+    "parse_articles": (["data/fetch_log.csv"], ["data/articles_clean.csv"]),
+    "analyze_articles": (["config/keywords.yml", "data/articles_clean.csv"], ["data/scores.csv"]),
+    "build_stats": (["data/scores.csv", "data/articles_clean.csv"], ["data/stats_daily.json"]),
+}
+
+# Les étapes sont importées comme modules : le dossier scripts doit être dans
+# le path (y compris pour les workers multiprocessing qui réimportent ce module)
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+
+def _stage_fingerprint(module_name: str) -> Optional[str]:
+    """
+    Empreinte du script d'une étape et de ses entrées (None si l'étape n'est jamais sautée).
+    
+    Le script (petit) est haché en entier ; les entrées, qui peuvent peser
+    plusieurs Go (articles_clean.csv), sont identifiées par (taille, mtime_ns).
+    """
+    if module_name not in STAGE_FILES:
+        return None
+    inputs, _ = STAGE_FILES[module_name]
+    h = hashlib.blake2b(digest_size=16)
+    
+    script = SCRIPTS_DIR / f"{module_name}.py"
+    h.update(script.read_bytes())
+    
+    for relative in inputs:
+        h.update(relative.encode('utf-8'))
+        try:
+            st = (BASE_DIR / relative).stat()
+        except FileNotFoundError:
+            h.update(b'\0absent')
+            continue
+        h.update(f"\0{st.st_size}\0{st.st_mtime_ns}".encode('ascii'))
+    return h.hexdigest()
+
+
+def _outputs_mtime(module_name: str) -> Optional[Dict[str, int]]:
+    """Date de modification des sorties d'une étape (None si l'une manque)."""
+    _, outputs = STAGE_FILES[module_name]
+    mtimes = {}
+    for output in outputs:
+        path = BASE_DIR / output
+        if not path.exists():
+            return None
+        mtimes[output] = path.stat().st_mtime_ns
+    return mtimes
+
+
+def _load_state() -> Dict:
+    """Charge l'état du dernier passage réussi de chaque étape."""
+    try:
+        with open(STATE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_state(state: Dict):
+    """Sauvegarde l'état des étapes."""
+    try:
+        STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(STATE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2)
+    except OSError as e:
+        print(f"⚠️  Impossible d'enregistrer l'état du pipeline: {e}")
+
+
+def _is_up_to_date(module_name: str, fingerprint: Optional[str], state: Dict) -> bool:
+    """Vrai si les entrées n'ont pas changé depuis le dernier succès et les sorties sont intactes."""
+    previous = state.get(module_name)
+    if fingerprint is None or not previous:
+        return False
+    return (previous.get('input_hash') == fingerprint
+            and previous.get('outputs_mtime') == _outputs_mtime(module_name))
+
+
+def run_step(module_name: str, description: str) -> bool:
+    """Exécute main() d'un script dans le processus courant et retourne True si succès."""
+    print(f"\n{'='*60}")
+    print(f"🔄 {description}")
+    print(f"{'='*60}\n")
+    
+    try:
+        module = importlib.import_module(module_name)
+        module.main()
+        print(f"\n✅ {description} terminé avec succès")
+        return True
+    except KeyboardInterrupt:
+        print(f"\n⚠️  Interruption par l'utilisateur")
+        return False
+    except SystemExit as e:
+        # Certains scripts quittent via sys.exit() : ne pas arrêter le pipeline
+        if e.code in (None, 0):
+            print(f"\n✅ {description} terminé avec succès")
+            return True
+        print(f"\n❌ Erreur lors de l'exécution de {module_name}: code de sortie {e.code}")
+        return False
+    except Exception as e:
+        # Trace complète, comme l'affichait l'exécution en sous-processus
+        traceback.print_exc()
+        print(f"\n❌ Erreur lors de l'exécution de {module_name}: {e}")
+        return False
 
 
 def run_script(script_name: str, description: str) -> bool:
-    """Exécute un script Python et retourne True si succès."""
+    """Exécute un script Python dans un sous-processus et retourne True si succès."""
     print(f"\n{'='*60}")
     print(f"🔄 {description}")
     print(f"{'='*60}\n")
@@ -25,11 +139,17 @@ def run_script(script_name: str, description: str) -> bool:
         print(f"❌ Script introuvable: {script_path}")
         return False
     
+    # Sous Linux, Popen passe par posix_spawn (sans copie de l'espace mémoire
+    # du parent) uniquement si close_fds=False et cwd=None : on ne précise le
+    # répertoire de travail que s'il diffère déjà de BASE_DIR
+    cwd = None if Path.cwd().resolve() == BASE_DIR.resolve() else str(BASE_DIR)
+    
     try:
         result = subprocess.run(
             [sys.executable, str(script_path)],
-            cwd=str(BASE_DIR),
-            check=True
+            cwd=cwd,
+            check=True,
+            close_fds=False
         )
         print(f"\n✅ {description} terminé avec succès")
         return True
@@ -43,23 +163,50 @@ def run_script(script_name: str, description: str) -> bool:
 
 def main():
     """Exécute le pipeline complet."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Exécute le pipeline complet')
+    parser.add_argument('--isolated', action='store_true',
+                       help='Lancer chaque étape dans un processus Python séparé')
+    parser.add_argument('--skip-existing', action='store_true',
+                       help='Sauter les étapes dont les entrées et le script n\'ont pas changé depuis leur dernier succès')
+    args = parser.parse_args()
+    
     print("🚀 Démarrage du pipeline complet de l'Observatoire des médias")
     print("=" * 60)
     
     steps = [
-        ("collect_urls.py", "Collecte des URLs"),
-        ("fetch_articles.py", "Téléchargement des articles"),
-        ("parse_articles.py", "Parsing des articles"),
-        ("analyze_articles.py", "Analyse et scoring"),
-        ("build_stats.py", "Génération des statistiques"),
+        ("collect_urls", "Collecte des URLs"),
+        ("fetch_articles", "Téléchargement des articles"),
+        ("parse_articles", "Parsing des articles"),
+        ("analyze_articles", "Analyse et scoring"),
+        ("build_stats", "Génération des statistiques"),
     ]
     
     success_count = 0
     failed_steps = []
+    state = _load_state()
     
-    for script_name, description in steps:
-        if run_script(script_name, description):
+    for module_name, description in steps:
+        # Empreinte prise avant l'étape : ce sont ses entrées telles qu'elle les lit
+        fingerprint = _stage_fingerprint(module_name)
+        if args.skip_existing and _is_up_to_date(module_name, fingerprint, state):
+            print(f"\n⏭️  {description} : entrées inchangées, étape sautée")
+            success_count += 1
+            continue
+        
+        if args.isolated:
+            ok = run_script(f"{module_name}.py", description)
+        else:
+            ok = run_step(module_name, description)
+        if ok:
             success_count += 1
+            if fingerprint is not None:
+                state[module_name] = {
+                    'input_hash': fingerprint,
+                    'outputs_mtime': _outputs_mtime(module_name)
+                }
+                _save_state(state)
         else:
             failed_steps.append(description)
             # Demander si on continue malgré l'erreur
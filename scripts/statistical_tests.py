@@ -7,17 +7,45 @@ Calcule les intervalles de confiance, tests de significativité, et métriques d
 
 import os
 import sys
-import csv
 import json
+import hashlib
 import numpy as np
+import pandas as pd
 from pathlib import Path
-from typing import Dict, List, Tuple
-from collections import defaultdict
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
 from scipy import stats
 from datetime import datetime
 
+# orjson (Rust) écrit le JSON bien plus vite que le module json standard
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+# Colonnes de scores.csv utilisées par l'analyse
+NUMERIC_COLUMNS = ['pct_militantisme', 'score_feministe', 'text_length']
+SCORE_COLUMNS = ['domain'] + NUMERIC_COLUMNS
+
+# Bornes (en nombre d'articles) entre lesquelles le test de normalité est réellement calculé
+NORMALITY_MIN_N = 20
+NORMALITY_MAX_N = 200
+
+# En dessous de ce nombre de médias, le démarrage des processus (import de
+# scipy dans chacun) coûte plus que les tests eux-mêmes
+PARALLEL_MIN_MEDIAS = 8
+
+
+@lru_cache(maxsize=1024)
+def _t_score(confidence: float, df: int) -> float:
+    """Quantile de Student bilatéral (la plupart des médias partagent le même df)."""
+    alpha = 1 - confidence
+    return float(stats.t.ppf(1 - alpha/2, df=df))
+
 
 class StatisticalAnalyzer:
     """Effectue des analyses statistiques sur les scores."""
@@ -27,46 +55,102 @@ class StatisticalAnalyzer:
         self.data_dir = self.base_dir / "data"
         self.scores_file = self.data_dir / "scores.csv"
         self.output_file = self.data_dir / "statistical_analysis.json"
+        # Fichiers dont dépendent les résultats : toute modification invalide le cache
+        self.cache_sources = [
+            self.base_dir / "config" / "keywords.yml",
+            self.base_dir / "scripts" / "analyze_articles.py",
+            Path(__file__),
+        ]
+    
+    def _cache_key(self) -> str:
+        """Empreinte de scores.csv et des fichiers qui conditionnent l'analyse."""
+        h = hashlib.blake2b(digest_size=8)
+        for path in [self.scores_file] + self.cache_sources:
+            h.update(path.name.encode('utf-8'))
+            if path.exists():
+                h.update(path.read_bytes())
+        return h.hexdigest()
+    
+    def _cached_key(self) -> str:
+        """Retourne la clé de cache des derniers résultats sauvegardés ('' si absente)."""
+        if not self.output_file.exists():
+            return ''
+        try:
+            if ORJSON_AVAILABLE:
+                with open(self.output_file, 'rb') as f:
+                    return orjson.loads(f.read()).get('cache_key', '')
+            with open(self.output_file, 'r', encoding='utf-8') as f:
+                return json.load(f).get('cache_key', '')
+        except (OSError, ValueError):
+            return ''
     
-    def load_scores(self) -> List[Dict]:
-        """Charge les scores depuis le fichier CSV."""
+    def load_scores(self) -> pd.DataFrame:
+        """Charge les scores depuis le fichier CSV (une colonne typée par variable)."""
         if not self.scores_file.exists():
             print(f"❌ Fichier introuvable: {self.scores_file}")
-            return []
-        
-        scores = []
-        with open(self.scores_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                try:
-                    row['pct_militantisme'] = float(row.get('pct_militantisme', 0))
-                    row['score_feministe'] = int(row.get('score_feministe', 0))
-                    row['text_length'] = int(row.get('text_length', 0))
-                    scores.append(row)
-                except (ValueError, KeyError) as e:
-                    print(f"⚠️  Erreur lors du chargement d'une ligne: {e}")
-                    continue
-        
-        return scores
+            return pd.DataFrame(columns=SCORE_COLUMNS)
+        
+        df = pd.read_csv(
+            self.scores_file,
+            usecols=lambda c: c in SCORE_COLUMNS,
+            dtype=str,
+            keep_default_na=False,
+            encoding='utf-8'
+        )
+        if 'domain' not in df.columns:
+            df['domain'] = 'unknown'
+        for column in NUMERIC_COLUMNS:
+            if column not in df.columns:
+                df[column] = 0
+            df[column] = pd.to_numeric(df[column], errors='coerce')
+        
+        # Les lignes dont une valeur numérique est illisible sont ignorées
+        invalid = df[NUMERIC_COLUMNS].isna().any(axis=1)
+        if invalid.any():
+            print(f"⚠️  {int(invalid.sum())} ligne(s) ignorée(s) : valeurs numériques invalides")
+            df = df[~invalid]
+        
+        return df.astype({
+            'pct_militantisme': float,
+            'score_feministe': int,
+            'text_length': int
+        }).reset_index(drop=True)
     
-    def calculate_confidence_interval(self, data: List[float], confidence: float = 0.95) -> Tuple[float, float, float]:
+    def _scores_by_media(self, scores: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Regroupe les pct_militantisme par média (ordre de première apparition)."""
+        # Codes de média dans l'ordre d'apparition, puis un tri stable : chaque
+        # groupe est une tranche contiguë d'un seul tableau trié
+        codes, medias = pd.factorize(scores['domain'], sort=False)
+        order = np.argsort(codes, kind='stable')
+        counts = np.bincount(codes, minlength=len(medias))
+        groups = np.split(scores['pct_militantisme'].to_numpy()[order], np.cumsum(counts)[:-1])
+        return dict(zip(medias, groups))
+    
+    def calculate_confidence_interval(self, data: np.ndarray, confidence: float = 0.95,
+                                      mean: Optional[float] = None,
+                                      std: Optional[float] = None) -> Tuple[float, float, float]:
         """
         Calcule l'intervalle de confiance pour une moyenne.
         
+        mean et std (ddof=1) peuvent être fournis s'ils sont déjà calculés.
+        
         Returns:
             (moyenne, borne_inférieure, borne_supérieure)
         """
         if len(data) < 2:
             return (np.mean(data), np.mean(data), np.mean(data))
         
-        data_array = np.array(data)
-        n = len(data_array)
-        mean = np.mean(data_array)
-        std = np.std(data_array, ddof=1)  # ddof=1 pour échantillon (n-1)
+        data_array = np.asarray(data, dtype=float)
+        n = data_array.size
+        if mean is None:
+            mean = np.mean(data_array)
+        if std is None:
+            # Variance en deux passes (np.std) : stable même si la moyenne est
+            # grande devant la dispersion, contrairement à Σx² - (Σx)²/n
+            std = np.std(data_array, ddof=1)  # ddof=1 pour échantillon (n-1)
         
         # Calcul du t-score pour l'intervalle de confiance
-        alpha = 1 - confidence
-        t_score = stats.t.ppf(1 - alpha/2, df=n-1)
+        t_score = _t_score(float(confidence), int(n - 1))
         
         # Erreur standard
         se = std / np.sqrt(n)
@@ -77,23 +161,37 @@ class StatisticalAnalyzer:
         
         return (mean, ci_lower, ci_upper)
     
-    def test_normality(self, data: List[float]) -> Dict:
+    def test_normality(self, data: np.ndarray) -> Dict:
         """Teste si les données suivent une distribution normale."""
         if len(data) < 3:
             return {'is_normal': False, 'p_value': 0, 'test': 'insufficient_data'}
         
-        data_array = np.array(data)
+        # Hors de la plage utile, le test n'apporte rien à la décision
+        # t-test / Mann-Whitney : on tranche sans appeler scipy
+        if len(data) < NORMALITY_MIN_N:
+            # Shapiro-Wilk sans puissance : test non paramétrique par prudence
+            return {
+                'is_normal': False,
+                'p_value': None,
+                'test': 'skipped',
+                'reason': f'n < {NORMALITY_MIN_N} : test sans puissance, non paramétrique par défaut'
+            }
+        if len(data) > NORMALITY_MAX_N:
+            # Théorème central limite : le t-test est robuste
+            return {
+                'is_normal': True,
+                'p_value': None,
+                'test': 'skipped',
+                'reason': f'n > {NORMALITY_MAX_N} : t-test robuste (théorème central limite)'
+            }
         
-        # Test de Shapiro-Wilk (pour n < 5000)
-        if len(data_array) < 5000:
-            stat, p_value = stats.shapiro(data_array)
-            test_name = 'shapiro-wilk'
-        else:
-            # Test de Kolmogorov-Smirnov pour grands échantillons
-            stat, p_value = stats.kstest(data_array, 'norm')
-            test_name = 'kolmogorov-smirnov'
+        data_array = np.asarray(data)
         
-        is_normal = p_value > 0.05
+        # Test de Shapiro-Wilk
+        stat, p_value = stats.shapiro(data_array)
+        test_name = 'shapiro-wilk'
+        
+        is_normal = bool(p_value > 0.05)
         
         return {
             'is_normal': is_normal,
@@ -102,13 +200,20 @@ class StatisticalAnalyzer:
             'test': test_name
         }
     
-    def compare_two_medias(self, media1_scores: List[float], media2_scores: List[float], 
-                          media1_name: str, media2_name: str) -> Dict:
+    def compare_two_medias(self, media1_scores: np.ndarray, media2_scores: np.ndarray, 
+                          media1_name: str, media2_name: str,
+                          norm1: Optional[Dict] = None, norm2: Optional[Dict] = None,
+                          ci1: Optional[Tuple] = None, ci2: Optional[Tuple] = None,
+                          ttest: Optional[Tuple[float, float]] = None) -> Dict:
         """
         Compare deux médias avec tests statistiques appropriés.
+        
+        Les tests de normalité et intervalles de confiance déjà calculés pour
+        chaque média peuvent être fournis pour éviter de les recalculer, de même
+        que le résultat (statistique, p-value) du test t (voir pairwise_ttests).
         """
-        media1_array = np.array(media1_scores)
-        media2_array = np.array(media2_scores)
+        media1_array = np.asarray(media1_scores)
+        media2_array = np.asarray(media2_scores)
         
         # Statistiques descriptives
         mean1 = np.mean(media1_array)
@@ -116,19 +221,26 @@ class StatisticalAnalyzer:
         diff = mean1 - mean2
         
         # Intervalles de confiance
-        ci1 = self.calculate_confidence_interval(media1_scores)
-        ci2 = self.calculate_confidence_interval(media2_scores)
+        if ci1 is None:
+            ci1 = self.calculate_confidence_interval(media1_scores)
+        if ci2 is None:
+            ci2 = self.calculate_confidence_interval(media2_scores)
         
         # Tests de normalité
-        norm1 = self.test_normality(media1_scores)
-        norm2 = self.test_normality(media2_scores)
+        if norm1 is None:
+            norm1 = self.test_normality(media1_scores)
+        if norm2 is None:
+            norm2 = self.test_normality(media2_scores)
         
         # Choisir le test approprié
         both_normal = norm1['is_normal'] and norm2['is_normal']
         
         if both_normal:
             # Test t de Student (paramétrique)
-            t_stat, p_value = stats.ttest_ind(media1_array, media2_array)
+            if ttest is not None:
+                t_stat, p_value = ttest
+            else:
+                t_stat, p_value = stats.ttest_ind(media1_array, media2_array)
             test_name = 't-test'
             test_statistic = float(t_stat)
         else:
@@ -155,7 +267,7 @@ class StatisticalAnalyzer:
             effect_size = 'fort'
         
         # Interprétation de la significativité
-        is_significant = p_value < 0.05
+        is_significant = bool(p_value < 0.05)
         
         return {
             'media1': media1_name,
@@ -177,56 +289,111 @@ class StatisticalAnalyzer:
             }
         }
     
-    def analyze_by_media(self, scores: List[Dict]) -> Dict:
-        """Analyse les scores par média."""
-        scores_by_media = defaultdict(list)
+    def pairwise_ttests(self, arrays: List[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Tests t de Student (variances égales, comme stats.ttest_ind) pour toutes
+        les paires d'échantillons en une seule évaluation matricielle.
         
-        for score in scores:
-            domain = score.get('domain', 'unknown')
-            scores_by_media[domain].append(score['pct_militantisme'])
+        Returns:
+            (statistiques, p-values) : matrices MxM, [i, j] compare arrays[i] à arrays[j]
+        """
+        n = np.array([len(a) for a in arrays], dtype=float)
+        means = np.array([np.mean(a) for a in arrays])
+        sum_squares = np.array([np.var(a, ddof=1) for a in arrays]) * (n - 1)
+        
+        df = n[:, None] + n[None, :] - 2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pooled_var = (sum_squares[:, None] + sum_squares[None, :]) / df
+            se = np.sqrt(pooled_var * (1 / n[:, None] + 1 / n[None, :]))
+            t_stats = (means[:, None] - means[None, :]) / se
+        p_values = 2 * stats.t.sf(np.abs(t_stats), df)
+        
+        return t_stats, p_values
+    
+    def describe_media(self, media_scores: np.ndarray) -> Dict:
+        """Statistiques descriptives, IC et normalité des scores d'un média."""
+        # Statistiques descriptives
+        mean = np.mean(media_scores)
+        median = np.median(media_scores)
+        std = np.std(media_scores, ddof=1)
+        n = len(media_scores)
         
-        results = {}
+        # Intervalle de confiance (moyenne et écart-type déjà calculés)
+        ci = self.calculate_confidence_interval(media_scores, mean=mean, std=std)
         
-        for media, media_scores in scores_by_media.items():
-            if len(media_scores) < 2:
-                continue
-            
-            # Statistiques descriptives
-            mean = np.mean(media_scores)
-            median = np.median(media_scores)
-            std = np.std(media_scores, ddof=1)
-            n = len(media_scores)
-            
-            # Intervalle de confiance
-            ci = self.calculate_confidence_interval(media_scores)
-            
-            # Test de normalité
-            normality = self.test_normality(media_scores)
-            
-            results[media] = {
-                'n': n,
-                'mean': float(mean),
-                'median': float(median),
-                'std': float(std),
-                'ci': {
-                    'mean': float(ci[0]),
-                    'lower': float(ci[1]),
-                    'upper': float(ci[2])
-                },
-                'normality': normality
-            }
+        # Test de normalité
+        normality = self.test_normality(media_scores)
         
-        return results
+        return {
+            'n': n,
+            'mean': float(mean),
+            'median': float(median),
+            'std': float(std),
+            'ci': {
+                'mean': float(ci[0]),
+                'lower': float(ci[1]),
+                'upper': float(ci[2])
+            },
+            'normality': normality
+        }
     
-    def compare_all_medias(self, scores: List[Dict]) -> List[Dict]:
-        """Compare tous les médias deux à deux."""
-        scores_by_media = defaultdict(list)
+    def analyze_by_media(self, scores: pd.DataFrame,
+                         pool: Optional[ProcessPoolExecutor] = None,
+                         scores_by_media: Optional[Dict[str, np.ndarray]] = None) -> Dict:
+        """Analyse les scores par média (en parallèle si un pool est fourni)."""
+        if scores_by_media is None:
+            scores_by_media = self._scores_by_media(scores)
+        
+        tasks = [(media, media_scores) for media, media_scores in scores_by_media.items()
+                 if len(media_scores) >= 2]
+        if pool is not None:
+            described = pool.map(_describe_one, tasks)
+        else:
+            described = (_describe_with(self, task) for task in tasks)
         
-        for score in scores:
-            domain = score.get('domain', 'unknown')
-            scores_by_media[domain].append(score['pct_militantisme'])
+        return dict(described)
+    
+    def compare_all_medias(self, scores: pd.DataFrame, by_media: Optional[Dict] = None,
+                           pool: Optional[ProcessPoolExecutor] = None,
+                           scores_by_media: Optional[Dict[str, np.ndarray]] = None) -> List[Dict]:
+        """Compare tous les médias deux à deux (voir iter_comparisons)."""
+        return list(self.iter_comparisons(scores, by_media, pool, scores_by_media))
+    
+    def iter_comparisons(self, scores: pd.DataFrame, by_media: Optional[Dict] = None,
+                         pool: Optional[ProcessPoolExecutor] = None,
+                         scores_by_media: Optional[Dict[str, np.ndarray]] = None) -> Iterator[Dict]:
+        """
+        Produit les comparaisons de médias deux à deux au fur et à mesure.
         
-        comparisons = []
+        by_media (résultat de analyze_by_media) permet de réutiliser les tests
+        de normalité et intervalles de confiance déjà calculés ; les paires
+        sont réparties sur le pool s'il est fourni (ordre des résultats conservé).
+        """
+        if scores_by_media is None:
+            scores_by_media = self._scores_by_media(scores)
+        
+        # Normalité et IC calculés une seule fois par média, pas à chaque paire
+        norm_cache = {}
+        ci_cache = {}
+        for media, media_scores in scores_by_media.items():
+            if len(media_scores) < 2:
+                continue
+            if by_media and media in by_media:
+                ci = by_media[media]['ci']
+                norm_cache[media] = by_media[media]['normality']
+                ci_cache[media] = (ci['mean'], ci['lower'], ci['upper'])
+            else:
+                norm_cache[media] = self.test_normality(media_scores)
+                ci_cache[media] = self.calculate_confidence_interval(media_scores)
+        
+        # Tests t de toutes les paires calculés d'un bloc ; seules les paires
+        # non normales passent par un appel individuel (Mann-Whitney)
+        eligible = list(norm_cache)
+        position = {media: i for i, media in enumerate(eligible)}
+        if eligible:
+            t_stats, p_values = self.pairwise_ttests([scores_by_media[m] for m in eligible])
+        
+        tasks = []
         media_list = list(scores_by_media.keys())
         
         # Comparer chaque paire de médias
@@ -237,38 +404,51 @@ class StatisticalAnalyzer:
                 
                 # Nécessite au moins 2 scores par média
                 if len(media1_scores) >= 2 and len(media2_scores) >= 2:
-                    comparison = self.compare_two_medias(
-                        media1_scores, media2_scores, media1, media2
-                    )
-                    comparisons.append(comparison)
-        
-        return comparisons
+                    pi, pj = position[media1], position[media2]
+                    tasks.append((
+                        media1_scores, media2_scores, media1, media2,
+                        norm_cache[media1], norm_cache[media2],
+                        ci_cache[media1], ci_cache[media2],
+                        (float(t_stats[pi, pj]), float(p_values[pi, pj]))
+                    ))
+        
+        if pool is not None:
+            chunksize = max(1, len(tasks) // (4 * (os.cpu_count() or 1)))
+            yield from pool.map(_compare_pair, tasks, chunksize=chunksize)
+        else:
+            for task in tasks:
+                yield self.compare_two_medias(*task)
     
-    def calculate_correlation(self, scores: List[Dict]) -> Dict:
+    def calculate_correlation(self, scores: pd.DataFrame) -> Dict:
         """Calcule les corrélations entre variables."""
-        text_lengths = [s['text_length'] for s in scores]
-        pct_militantismes = [s['pct_militantisme'] for s in scores]
-        scores_feministes = [s['score_feministe'] for s in scores]
-        
         correlations = {}
         
+        n = len(scores)
+        if n <= 2:
+            return correlations
+        
+        # Une seule matrice de corrélation pour toutes les paires de colonnes
+        # (0: text_length, 1: pct_militantisme, 2: score_feministe)
+        columns = scores[['text_length', 'pct_militantisme', 'score_feministe']].to_numpy(dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            r = np.corrcoef(columns, rowvar=False)
+            # p-value bilatérale (identique à stats.pearsonr) : t = r·sqrt((n-2)/(1-r²))
+            t = r * np.sqrt((n - 2) / (1 - r * r))
+        p = 2 * stats.t.sf(np.abs(t), n - 2)
+        
         # Corrélation longueur vs score militant
-        if len(text_lengths) > 2:
-            corr_length_score, p_length = stats.pearsonr(text_lengths, pct_militantismes)
-            correlations['length_vs_militantism'] = {
-                'correlation': float(corr_length_score),
-                'p_value': float(p_length),
-                'is_significant': p_length < 0.05
-            }
+        correlations['length_vs_militantism'] = {
+            'correlation': float(r[0, 1]),
+            'p_value': float(p[0, 1]),
+            'is_significant': bool(p[0, 1] < 0.05)
+        }
         
         # Corrélation score féministe vs pourcentage militantisme
-        if len(scores_feministes) > 2:
-            corr_score_pct, p_score = stats.pearsonr(scores_feministes, pct_militantismes)
-            correlations['score_vs_percentage'] = {
-                'correlation': float(corr_score_pct),
-                'p_value': float(p_score),
-                'is_significant': p_score < 0.05
-            }
+        correlations['score_vs_percentage'] = {
+            'correlation': float(r[2, 1]),
+            'p_value': float(p[2, 1]),
+            'is_significant': bool(p[2, 1] < 0.05)
+        }
         
         return correlations
     
@@ -277,17 +457,38 @@ class StatisticalAnalyzer:
         print("📊 Analyse statistique des scores")
         print("=" * 80)
         
+        cache_key = self._cache_key() if self.scores_file.exists() else ''
+        if cache_key and cache_key == self._cached_key():
+            print(f"✅ scores.csv inchangé, résultats déjà à jour dans {self.output_file}")
+            print("=" * 80)
+            return
+        
         scores = self.load_scores()
         
-        if not scores:
+        if scores.empty:
             print("❌ Aucun score trouvé")
             return
         
         print(f"📈 {len(scores)} articles analysés")
         
+        # Un seul pool partagé par l'analyse par média et les comparaisons
+        pool = None
+        if scores['domain'].nunique() >= PARALLEL_MIN_MEDIAS:
+            pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+        try:
+            self._run_tests(scores, pool, cache_key)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+    
+    def _run_tests(self, scores: pd.DataFrame, pool: Optional[ProcessPoolExecutor], cache_key: str):
+        """Tests par média, comparaisons, corrélations puis sauvegarde."""
+        # Regroupement par média calculé une fois pour l'analyse et les comparaisons
+        scores_by_media = self._scores_by_media(scores)
+        
         # Analyse par média
         print("\n🔍 Analyse par média...")
-        by_media = self.analyze_by_media(scores)
+        by_media = self.analyze_by_media(scores, pool, scores_by_media)
         
         print("\n📊 Statistiques par média:")
         print("-" * 80)
@@ -298,48 +499,105 @@ class StatisticalAnalyzer:
             print(f"  Médiane = {stats['median']:.2f}%")
             print(f"  Écart-type = {stats['std']:.2f}")
             print(f"  IC 95% = [{stats['ci']['lower']:.2f}, {stats['ci']['upper']:.2f}]")
-            print(f"  Distribution normale: {stats['normality']['is_normal']} (p={stats['normality']['p_value']:.4f})")
+            normality = stats['normality']
+            if normality['p_value'] is None:
+                print(f"  Distribution normale: {normality['is_normal']} ({normality['reason']})")
+            else:
+                print(f"  Distribution normale: {normality['is_normal']} (p={normality['p_value']:.4f})")
+        
+        correlations = self.calculate_correlation(scores)
         
-        # Comparaisons deux à deux
+        # Comparaisons deux à deux : écrites dans le JSON au fur et à mesure
+        # (jamais toutes en mémoire), dans un fichier temporaire remplacé à la fin
         print("\n🔬 Comparaisons entre médias:")
         print("-" * 80)
-        comparisons = self.compare_all_medias(scores)
-        
-        for comp in comparisons[:10]:  # Afficher les 10 premières
-            print(f"\n{comp['media1']} vs {comp['media2']}:")
-            print(f"  Différence = {comp['difference']:.2f} points")
-            print(f"  Test = {comp['test']} (statistique = {comp['test_statistic']:.3f})")
-            print(f"  p-value = {comp['p_value']:.4f}")
-            print(f"  Significatif: {'✅ Oui' if comp['is_significant'] else '❌ Non'}")
-            print(f"  Taille d'effet (Cohen's d) = {comp['cohens_d']:.3f} ({comp['effect_size']})")
+        comparisons = self.iter_comparisons(scores, by_media, pool, scores_by_media)
+        
+        tmp_file = self.output_file.with_name(self.output_file.name + '.tmp')
+        with open(tmp_file, 'w', encoding='utf-8', newline='\n') as f:
+            f.write('{\n')
+            header = {
+                'analysis_date': datetime.now().isoformat(),
+                'cache_key': cache_key,
+                'total_articles': len(scores),
+                'by_media': by_media
+            }
+            for key, value in header.items():
+                f.write(f'  {_to_json(key)}: {_indent_json(_to_json(value), 2)},\n')
+            
+            f.write('  "comparisons": [')
+            count = 0
+            for comp in comparisons:
+                f.write(',\n    ' if count else '\n    ')
+                f.write(_indent_json(_to_json(comp), 4))
+                
+                if count < 10:  # Afficher les 10 premières
+                    print(f"\n{comp['media1']} vs {comp['media2']}:")
+                    print(f"  Différence = {comp['difference']:.2f} points")
+                    print(f"  Test = {comp['test']} (statistique = {comp['test_statistic']:.3f})")
+                    print(f"  p-value = {comp['p_value']:.4f}")
+                    print(f"  Significatif: {'✅ Oui' if comp['is_significant'] else '❌ Non'}")
+                    print(f"  Taille d'effet (Cohen's d) = {comp['cohens_d']:.3f} ({comp['effect_size']})")
+                count += 1
+            f.write('\n  ],\n' if count else '],\n')
+            
+            f.write(f'  "correlations": {_indent_json(_to_json(correlations), 2)}\n}}')
+        os.replace(tmp_file, self.output_file)
         
         # Corrélations
         print("\n🔗 Corrélations:")
         print("-" * 80)
-        correlations = self.calculate_correlation(scores)
-        
         for name, corr in correlations.items():
             print(f"\n{name}:")
             print(f"  Corrélation = {corr['correlation']:.3f}")
             print(f"  p-value = {corr['p_value']:.4f}")
             print(f"  Significatif: {'✅ Oui' if corr['is_significant'] else '❌ Non'}")
         
-        # Sauvegarder les résultats
-        results = {
-            'analysis_date': datetime.now().isoformat(),
-            'total_articles': len(scores),
-            'by_media': by_media,
-            'comparisons': comparisons,
-            'correlations': correlations
-        }
-        
-        with open(self.output_file, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
-        
         print(f"\n✅ Résultats sauvegardés dans {self.output_file}")
         print("=" * 80)
 
 
+def _to_json(obj) -> str:
+    """Sérialise obj en JSON indenté (orjson si disponible)."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(
+            obj,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        ).decode('utf-8')
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
+
+def _indent_json(text: str, spaces: int) -> str:
+    """Décale les lignes suivantes d'un JSON pour l'imbriquer à ce niveau."""
+    return text.replace('\n', '\n' + ' ' * spaces)
+
+
+# Analyseur propre à chaque processus de travail (créé à la première tâche)
+_worker_analyzer: Optional[StatisticalAnalyzer] = None
+
+
+def _get_worker_analyzer() -> StatisticalAnalyzer:
+    global _worker_analyzer
+    if _worker_analyzer is None:
+        _worker_analyzer = StatisticalAnalyzer()
+    return _worker_analyzer
+
+
+def _describe_with(analyzer: StatisticalAnalyzer, task: Tuple[str, np.ndarray]) -> Tuple[str, Dict]:
+    media, media_scores = task
+    return media, analyzer.describe_media(media_scores)
+
+
+def _describe_one(task: Tuple[str, np.ndarray]) -> Tuple[str, Dict]:
+    """Statistiques d'un média dans un processus du pool ; task = (média, scores)."""
+    return _describe_with(_get_worker_analyzer(), task)
+
+
+def _compare_pair(task: Tuple) -> Dict:
+    """Compare une paire de médias dans un processus du pool (arguments de compare_two_medias)."""
+    return _get_worker_analyzer().compare_two_medias(*task)
+
+
 def main():
     analyzer = StatisticalAnalyzer()
     analyzer.run_full_analysis()
@@ -8,13 +8,50 @@ Teste l'impact de la modification des mots-clés sur les scores.
 import os
 import sys
 import csv
+import json
 import yaml
+import pickle
+import hashlib
+import importlib.util
+import pandas as pd
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from collections import defaultdict
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# pyarrow permet de garder le texte en minuscules d'articles_clean.csv en Parquet
+# (pandas l'utilise pour read_parquet/to_parquet : sa présence suffit)
+PYARROW_AVAILABLE = importlib.util.find_spec('pyarrow') is not None
+
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+# Colonnes numériques de scores.csv et leur type
+SCORE_DTYPES = {
+    'score_feministe': int,
+    'score_balance': int,
+    'pct_militantisme': float
+}
+
+
+def flatten_keywords(keywords_config) -> List[str]:
+    """
+    Liste des mots-clés d'une section de keywords.yml : liste simple (ancien
+    format) ou catégories {'nom': {'weight': ..., 'keywords': [...]}}.
+    """
+    if isinstance(keywords_config, list):
+        return keywords_config
+    flat = []
+    if isinstance(keywords_config, dict):
+        for category_data in keywords_config.values():
+            if isinstance(category_data, dict):
+                flat.extend(category_data.get('keywords', []) or [])
+    return flat
+
 
 class SensitivityTester:
     """Teste la sensibilité des résultats aux variations des mots-clés."""
@@ -24,6 +61,7 @@ class SensitivityTester:
         self.config_dir = self.base_dir / "config"
         self.data_dir = self.base_dir / "data"
         self.scores_file = self.data_dir / "scores.csv"
+        self.cache_dir = self.data_dir / ".cache"
     
     def load_keywords(self) -> Dict:
         """Charge les mots-clés depuis la configuration."""
@@ -31,61 +69,56 @@ class SensitivityTester:
         with open(keywords_file, 'r', encoding='utf-8') as f:
             return yaml.safe_load(f)
     
-    def load_scores(self) -> List[Dict]:
-        """Charge les scores existants."""
+    def load_scores(self) -> pd.DataFrame:
+        """Charge les scores existants (une colonne typée par variable)."""
         if not self.scores_file.exists():
             print("❌ Fichier scores.csv non trouvé")
-            return []
-        
-        scores = []
-        with open(self.scores_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                # Convertir les valeurs numériques
-                row['score_feministe'] = int(row.get('score_feministe', 0))
-                row['score_balance'] = int(row.get('score_balance', 0))
-                row['pct_militantisme'] = float(row.get('pct_militantisme', 0))
-                scores.append(row)
-        
-        return scores
+            return pd.DataFrame(columns=['url', 'domain'] + list(SCORE_DTYPES))
+        
+        df = pd.read_csv(
+            self.scores_file,
+            usecols=lambda c: c in ('url', 'domain') or c in SCORE_DTYPES,
+            dtype=str,
+            keep_default_na=False,
+            encoding='utf-8'
+        )
+        for column in ('url', 'domain'):
+            if column not in df.columns:
+                df[column] = '' if column == 'url' else 'unknown'
+        # Convertir les valeurs numériques
+        for column, dtype in SCORE_DTYPES.items():
+            values = pd.to_numeric(df[column], errors='coerce') if column in df.columns else 0
+            df[column] = pd.Series(values, index=df.index).fillna(0).astype(dtype)
+        
+        return df
     
-    def calculate_stats_by_media(self, scores: List[Dict]) -> Dict[str, Dict]:
+    def calculate_stats_by_media(self, scores: pd.DataFrame) -> Dict[str, Dict]:
         """Calcule les statistiques par média."""
-        stats_by_media = defaultdict(lambda: {
-            'n_articles': 0,
-            'pct_militantismes': [],
-            'scores_feministes': [],
-            'scores_balance': []
-        })
-        
-        for score in scores:
-            domain = score.get('domain', 'unknown')
-            stats_by_media[domain]['n_articles'] += 1
-            stats_by_media[domain]['pct_militantismes'].append(score['pct_militantisme'])
-            stats_by_media[domain]['scores_feministes'].append(score['score_feministe'])
-            stats_by_media[domain]['scores_balance'].append(score['score_balance'])
-        
-        # Calculer les moyennes
-        result = {}
-        for domain, stats in stats_by_media.items():
-            n = stats['n_articles']
-            result[domain] = {
-                'n_articles': n,
-                'pct_militantisme_moyen': sum(stats['pct_militantismes']) / n if n > 0 else 0,
-                'score_feministe_moyen': sum(stats['scores_feministes']) / n if n > 0 else 0,
-                'score_balance_moyen': sum(stats['scores_balance']) / n if n > 0 else 0
-            }
-        
-        return result
+        grouped = scores.groupby('domain', sort=False).agg(
+            n_articles=('domain', 'size'),
+            pct_militantisme_moyen=('pct_militantisme', 'mean'),
+            score_feministe_moyen=('score_feministe', 'mean'),
+            score_balance_moyen=('score_balance', 'mean')
+        )
+        return grouped.to_dict(orient='index')
     
-    def test_removal(self, keywords: Dict, keyword_to_remove: str, category: str = 'feminist_keywords'):
-        """Teste l'impact de la suppression d'un mot-clé."""
+    def test_removal(self, keywords: Dict, keyword_to_remove: str, category: str = 'feminist_keywords',
+                     scan: Optional[Dict] = None, scores_baseline: Optional[pd.DataFrame] = None,
+                     scores_by_url: Optional[pd.DataFrame] = None):
+        """
+        Teste l'impact de la suppression d'un mot-clé.
+        
+        scan (résultat de _scan_articles sur des mots-clés incluant celui-ci) et
+        scores_baseline évitent de relire les CSV à chaque mot-clé testé ;
+        scores_by_url (scores indexés par url) évite de reconstruire l'index.
+        """
         print(f"\n🧪 Test : Suppression de '{keyword_to_remove}' ({category})")
         print("-" * 80)
         
         # Charger les scores actuels (baseline)
-        scores_baseline = self.load_scores()
-        if not scores_baseline:
+        if scores_baseline is None:
+            scores_baseline = self.load_scores()
+        if scores_baseline.empty:
             print("❌ Aucun score trouvé. Lancez d'abord analyze_articles.py")
             return None
         
@@ -94,26 +127,23 @@ class SensitivityTester:
         # Simuler la suppression (on ne peut pas vraiment le faire sans réanalyser)
         # Mais on peut estimer l'impact en comptant combien d'articles utilisent ce mot-clé
         keyword_lower = keyword_to_remove.lower()
-        articles_with_keyword = []
         
-        # Charger les articles pour vérifier
-        articles_file = self.data_dir / "articles_clean.csv"
-        if articles_file.exists():
-            with open(articles_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    text = row.get('text', '').lower()
-                    if keyword_lower in text:
-                        articles_with_keyword.append(row['url'])
+        # Articles contenant le mot-clé, relevés lors du parcours des articles
+        if scan is None:
+            scan = self._scan_articles({category: [keyword_to_remove]})
+        articles_with_keyword = scan['urls_by_keyword'].get(keyword_lower, set()) if scan else set()
         
-        # Trouver les scores correspondants
-        affected_scores = [s for s in scores_baseline if s['url'] in articles_with_keyword]
+        # Trouver les scores correspondants : recherche dans l'index des urls,
+        # proportionnelle au nombre d'articles concernés
+        if scores_by_url is None:
+            scores_by_url = scores_baseline.set_index('url')
+        affected_scores = scores_by_url.loc[scores_by_url.index.intersection(list(articles_with_keyword))]
         
         print(f"📊 Articles contenant '{keyword_to_remove}' : {len(affected_scores)}")
         
-        if affected_scores:
+        if not affected_scores.empty:
             # Estimer l'impact (approximation)
-            avg_score_before = sum(s['pct_militantisme'] for s in affected_scores) / len(affected_scores)
+            avg_score_before = affected_scores['pct_militantisme'].mean()
             
             # Simuler la réduction (chaque occurrence compte pour ~1 point dans le score)
             # C'est une approximation grossière
@@ -129,41 +159,192 @@ class SensitivityTester:
             'impact_estimated': 'Faible à modéré'
         }
     
-    def test_keyword_frequency(self, keywords: Dict):
-        """Analyse la fréquence d'utilisation de chaque mot-clé."""
-        print("\n📊 ANALYSE DE FRÉQUENCE DES MOTS-CLÉS")
-        print("=" * 80)
+    def _build_keyword_automaton(self, keyword_lists: Dict[str, List[str]]) -> 'ahocorasick.Automaton':
+        """
+        Construit un automate Aho-Corasick sur tous les mots-clés.
+        
+        keyword_lists: {catégorie: mots-clés} ; chaque mot-clé en minuscules est
+        associé aux (catégorie, mot-clé) dont il faut incrémenter le compteur.
+        """
+        by_key = defaultdict(list)
+        for category, keyword_list in keyword_lists.items():
+            for keyword in keyword_list:
+                if keyword:
+                    by_key[keyword.lower()].append((category, keyword))
+        
+        automaton = ahocorasick.Automaton()
+        for key, key_targets in by_key.items():
+            automaton.add_word(key, (key, tuple(key_targets)))
+        automaton.make_automaton()
+        return automaton
+    
+    def _load_or_build_automaton(self, keyword_lists: Dict[str, List[str]]) -> 'ahocorasick.Automaton':
+        """
+        Retourne l'automate des mots-clés, depuis data/.cache s'il a déjà été
+        construit pour exactement ces listes (clé : empreinte des mots-clés).
+        """
+        digest = hashlib.blake2b(
+            json.dumps(keyword_lists, ensure_ascii=False, sort_keys=True).encode('utf-8'),
+            digest_size=8
+        ).hexdigest()
+        cache_file = self.cache_dir / f"keywords_ac_{digest}.pkl"
+        
+        if cache_file.exists():
+            try:
+                with open(cache_file, 'rb') as f:
+                    return pickle.load(f)
+            except Exception as e:
+                print(f"⚠️  Cache d'automate illisible, reconstruction: {e}")
+        
+        automaton = self._build_keyword_automaton(keyword_lists)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Un seul cache à la fois : les automates d'anciens keywords.yml sont obsolètes
+            for old_file in self.cache_dir.glob("keywords_ac_*.pkl"):
+                old_file.unlink()
+            with open(cache_file, 'wb') as f:
+                pickle.dump(automaton, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError as e:
+            print(f"⚠️  Impossible d'écrire le cache d'automate: {e}")
+        return automaton
+    
+    def _count_with_automaton(self, automaton: 'ahocorasick.Automaton', text: str,
+                              counts_by_category: Dict[str, Dict[str, int]]) -> Iterable[str]:
+        """
+        Compte les occurrences de chaque mot-clé dans text (sans chevauchement,
+        comme str.count) et retourne les mots-clés (en minuscules) trouvés.
+        """
+        last_end = {}
+        for end, (key, key_targets) in automaton.iter(text):
+            if end - len(key) < last_end.get(key, -1):
+                continue
+            last_end[key] = end
+            for category, keyword in key_targets:
+                counts_by_category[category][keyword] += 1
+        return last_end.keys()
+    
+    def _lowered_cache_file(self, articles_file: Path) -> Path:
+        """Chemin du cache Parquet pour le contenu actuel d'articles_clean.csv."""
+        h = hashlib.blake2b(digest_size=8)
+        with open(articles_file, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                h.update(chunk)
+        return self.cache_dir / f"articles_lower_{h.hexdigest()}.parquet"
+    
+    def _iter_lowered_articles(self, articles_file: Path) -> Iterator[Tuple[str, str]]:
+        """
+        Produit (url, texte en minuscules) pour chaque article. Avec pyarrow, les
+        textes en minuscules sont conservés dans data/.cache (clé : empreinte du
+        CSV) et relus tels quels tant qu'articles_clean.csv ne change pas.
+        """
+        if not PYARROW_AVAILABLE:
+            with open(articles_file, 'r', encoding='utf-8') as f:
+                for row in csv.DictReader(f):
+                    yield row.get('url', ''), row.get('text', '').lower()
+            return
         
+        cache_file = self._lowered_cache_file(articles_file)
+        if cache_file.exists():
+            df = pd.read_parquet(cache_file)
+        else:
+            df = pd.read_csv(
+                articles_file,
+                usecols=lambda c: c in ('url', 'text'),
+                dtype=str,
+                keep_default_na=False,
+                encoding='utf-8'
+            )
+            for column in ('url', 'text'):
+                if column not in df.columns:
+                    df[column] = ''
+            df = df[['url', 'text']]
+            df['text'] = df['text'].str.lower()
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                # Un seul cache à la fois : les versions précédentes sont obsolètes
+                for old_file in self.cache_dir.glob("articles_lower_*.parquet"):
+                    old_file.unlink()
+                df.to_parquet(cache_file, index=False)
+            except OSError as e:
+                print(f"⚠️  Impossible d'écrire le cache des textes: {e}")
+        
+        yield from zip(df['url'], df['text'])
+    
+    def _scan_articles(self, keywords: Dict) -> Optional[Dict]:
+        """
+        Parcourt articles_clean.csv une seule fois pour tous les tests : nombre
+        d'occurrences par mot-clé et URLs des articles contenant chaque mot-clé
+        (clé en minuscules). Retourne None si le fichier est absent.
+        """
         articles_file = self.data_dir / "articles_clean.csv"
         if not articles_file.exists():
-            print("❌ Fichier articles_clean.csv non trouvé")
-            return
+            return None
         
         # Compter les occurrences
         feminist_counts = defaultdict(int)
         balanced_counts = defaultdict(int)
+        urls_by_keyword = defaultdict(set)
         total_articles = 0
         
-        with open(articles_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                total_articles += 1
-                text = row.get('text', '').lower()
-                
-                # Compter les mots-clés féministes
-                for keyword in keywords.get('feminist_keywords', []):
-                    keyword_lower = keyword.lower()
-                    if keyword_lower in text:
-                        # Compter les occurrences (approximation)
-                        count = text.count(keyword_lower)
-                        feminist_counts[keyword] += count
-                
-                # Compter les mots-clés équilibrants
-                for keyword in keywords.get('balanced_keywords', []):
-                    keyword_lower = keyword.lower()
-                    if keyword_lower in text:
-                        count = text.count(keyword_lower)
-                        balanced_counts[keyword] += count
+        feminist_keywords = flatten_keywords(keywords.get('feminist_keywords', []))
+        balanced_keywords = flatten_keywords(keywords.get('balanced_keywords', []))
+        counts_by_category = {'feminist': feminist_counts, 'balanced': balanced_counts}
+        # Minuscules calculées une fois par mot-clé, pas à chaque article
+        feminist_lowered = [(keyword, keyword.lower()) for keyword in feminist_keywords if keyword]
+        balanced_lowered = [(keyword, keyword.lower()) for keyword in balanced_keywords if keyword]
+        
+        automaton = None
+        if AHOCORASICK_AVAILABLE:
+            automaton = self._load_or_build_automaton({
+                'feminist': feminist_keywords,
+                'balanced': balanced_keywords,
+            })
+        
+        for url, text in self._iter_lowered_articles(articles_file):
+            total_articles += 1
+            
+            if automaton is not None:
+                # Un seul parcours du texte pour tous les mots-clés
+                for keyword_lower in self._count_with_automaton(automaton, text, counts_by_category):
+                    urls_by_keyword[keyword_lower].add(url)
+                continue
+            
+            # Compter les mots-clés féministes
+            for keyword, keyword_lower in feminist_lowered:
+                if keyword_lower in text:
+                    # Compter les occurrences (approximation)
+                    count = text.count(keyword_lower)
+                    feminist_counts[keyword] += count
+                    urls_by_keyword[keyword_lower].add(url)
+            
+            # Compter les mots-clés équilibrants
+            for keyword, keyword_lower in balanced_lowered:
+                if keyword_lower in text:
+                    count = text.count(keyword_lower)
+                    balanced_counts[keyword] += count
+                    urls_by_keyword[keyword_lower].add(url)
+        
+        return {
+            'total_articles': total_articles,
+            'feminist_counts': feminist_counts,
+            'balanced_counts': balanced_counts,
+            'urls_by_keyword': urls_by_keyword
+        }
+    
+    def test_keyword_frequency(self, keywords: Dict, scan: Optional[Dict] = None):
+        """Analyse la fréquence d'utilisation de chaque mot-clé."""
+        print("\n📊 ANALYSE DE FRÉQUENCE DES MOTS-CLÉS")
+        print("=" * 80)
+        
+        if scan is None:
+            scan = self._scan_articles(keywords)
+        if scan is None:
+            print("❌ Fichier articles_clean.csv non trouvé")
+            return
+        
+        feminist_counts = scan['feminist_counts']
+        balanced_counts = scan['balanced_counts']
+        total_articles = scan['total_articles']
         
         print(f"\n📰 Total d'articles analysés : {total_articles}")
         
@@ -180,13 +361,13 @@ class SensitivityTester:
             print(f"   {keyword:40s} : {count:5d} occurrences ({pct:.1f}% des articles)")
         
         print("\n⚠️  Mots-clés jamais trouvés :")
-        all_feminist = set(keywords.get('feminist_keywords', []))
+        all_feminist = set(flatten_keywords(keywords.get('feminist_keywords', [])))
         found_feminist = set(feminist_counts.keys())
         never_found_feminist = all_feminist - found_feminist
         if never_found_feminist:
             print(f"   Féministes ({len(never_found_feminist)}) : {', '.join(list(never_found_feminist)[:10])}")
         
-        all_balanced = set(keywords.get('balanced_keywords', []))
+        all_balanced = set(flatten_keywords(keywords.get('balanced_keywords', [])))
         found_balanced = set(balanced_counts.keys())
         never_found_balanced = all_balanced - found_balanced
         if never_found_balanced:
@@ -199,8 +380,13 @@ class SensitivityTester:
         
         keywords = self.load_keywords()
         
+        # Un seul parcours des articles et un seul chargement des scores pour tous les tests
+        scan = self._scan_articles(keywords)
+        scores_baseline = self.load_scores()
+        scores_by_url = scores_baseline.set_index('url')
+        
         # Test 1 : Analyse de fréquence
-        self.test_keyword_frequency(keywords)
+        self.test_keyword_frequency(keywords, scan)
         
         # Test 2 : Impact de suppression (exemples)
         print("\n" + "=" * 80)
@@ -208,10 +394,11 @@ class SensitivityTester:
         print("=" * 80)
         
         # Tester quelques mots-clés fréquents
-        if keywords.get('feminist_keywords'):
-            top_keywords = keywords['feminist_keywords'][:5]
+        feminist_keywords = flatten_keywords(keywords.get('feminist_keywords', []))
+        if feminist_keywords:
+            top_keywords = feminist_keywords[:5]
             for keyword in top_keywords:
-                self.test_removal(keywords, keyword, 'feminist_keywords')
+                self.test_removal(keywords, keyword, 'feminist_keywords', scan, scores_baseline, scores_by_url)
         
         print("\n" + "=" * 80)
         print("✅ Tests terminés")
@@ -8,23 +8,199 @@ Permet d'annoter manuellement un échantillon d'articles et de comparer avec les
 import os
 import sys
 import csv
+import importlib.util
 import json
+import math
 import random
+import numpy as np
+import pandas as pd
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List, Optional
-from collections import defaultdict
+from typing import Callable, Dict, Iterator, List, Optional, TextIO, Tuple
+from collections import namedtuple
 from datetime import datetime
 
-try:
-    from sklearn.metrics import cohen_kappa_score, accuracy_score, precision_score, recall_score, f1_score
-    from scipy.stats import pearsonr
-except ImportError:
-    print("⚠️  scikit-learn et scipy requis pour ce script")
-    print("   Installez avec: pip install scikit-learn scipy")
-    sys.exit(1)
+# pyarrow permet de garder les CSV relus à chaque --analyze en Parquet
+# (pandas l'utilise pour read_parquet/to_parquet : sa présence suffit)
+PYARROW_AVAILABLE = importlib.util.find_spec('pyarrow') is not None
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+# Bornes des catégories de score pour le Kappa et seuil "militant" (en %)
+CATEGORY_BOUNDS = [25, 50, 75]
+MILITANT_THRESHOLD = 30
+
+# Échelles d'interprétation : LABELS[i] pour THRESHOLDS[i-1] <= valeur < THRESHOLDS[i]
+# (même convention que np.digitize sur CATEGORY_BOUNDS)
+KAPPA_THRESHOLDS = np.array([0, 0.2, 0.4, 0.6, 0.8])
+KAPPA_LABELS = [
+    "Accord pire que le hasard", "Accord faible", "Accord passable",
+    "Accord modéré", "Accord bon", "Accord excellent"
+]
+ALPHA_THRESHOLDS = np.array([0.667, 0.8])
+ALPHA_LABELS = ["Fiabilité insuffisante", "Fiabilité provisoire", "Fiabilité satisfaisante"]
+
+# Score par défaut (pct_militantisme, score_feministe) des articles absents de scores.csv
+_EMPTY_SCORE: Tuple[float, int] = (0, 0)
+
+# Seuls champs d'articles_clean.csv utilisés pour l'annotation
+Article = namedtuple('Article', ['url', 'title', 'text'])
+
+
+def _read_articles(f: TextIO) -> Iterator[Article]:
+    """Lit articles_clean.csv ligne à ligne en Article (sans dict par ligne)."""
+    reader = csv.reader(f)
+    header = next(reader, [])
+    positions = [header.index(field) if field in header else None for field in Article._fields]
+    # Lignes vides ou tronquées ignorées (DictReader sautait déjà les lignes vides)
+    min_len = max((i for i in positions if i is not None), default=-1) + 1
+    
+    if None not in positions:
+        getter = itemgetter(*positions)
+        for row in reader:
+            if len(row) >= min_len:
+                yield Article._make(getter(row))
+    else:
+        # Colonne absente : champ vide
+        for row in reader:
+            if row and len(row) >= min_len:
+                yield Article._make(row[i] if i is not None else '' for i in positions)
+
+
+def _fused_metrics_numpy(auto: np.ndarray, manual: np.ndarray, bounds: np.ndarray, threshold: float):
+    """Catégories, classes binaires, MAE et RMSE (version NumPy)."""
+    auto_cat = np.digitize(auto, bounds)
+    manual_cat = np.digitize(manual, bounds)
+    auto_bin = (auto >= threshold).astype(np.int8)
+    manual_bin = (manual >= threshold).astype(np.int8)
+    
+    # Un seul tableau de différences ; np.dot donne Σd² sans temporaire
+    diff = auto - manual
+    n = diff.shape[0]
+    mae = np.abs(diff).sum() / n
+    rmse = np.sqrt(np.dot(diff, diff) / n)
+    
+    return auto_cat, manual_cat, auto_bin, manual_bin, mae, rmse
+
+
+def _fused_metrics_loop(auto, manual, bounds, threshold):
+    """Même calcul que _fused_metrics_numpy, en un seul parcours (compilé par numba)."""
+    n = auto.shape[0]
+    auto_cat = np.empty(n, dtype=np.int64)
+    manual_cat = np.empty(n, dtype=np.int64)
+    auto_bin = np.empty(n, dtype=np.int8)
+    manual_bin = np.empty(n, dtype=np.int8)
+    abs_sum = 0.0
+    sq_sum = 0.0
+    
+    for i in range(n):
+        a = auto[i]
+        m = manual[i]
+        
+        # Équivalent de np.digitize : nombre de bornes <= score
+        ca = 0
+        cm = 0
+        for b in bounds:
+            if a >= b:
+                ca += 1
+            if m >= b:
+                cm += 1
+        auto_cat[i] = ca
+        manual_cat[i] = cm
+        
+        auto_bin[i] = 1 if a >= threshold else 0
+        manual_bin[i] = 1 if m >= threshold else 0
+        
+        d = a - m
+        abs_sum += abs(d)
+        sq_sum += d * d
+    
+    return auto_cat, manual_cat, auto_bin, manual_bin, abs_sum / n, np.sqrt(sq_sum / n)
+
+
+# Noyau retenu au premier calcul de métriques : numba n'est importé (et la
+# boucle compilée) que par --analyze, jamais par --create-template
+_fused_metrics: Optional[Callable] = None
+
+
+def _get_fused_metrics() -> Callable:
+    global _fused_metrics
+    if _fused_metrics is None:
+        try:
+            from numba import njit
+        except ImportError:
+            _fused_metrics = _fused_metrics_numpy
+        else:
+            _fused_metrics = njit(cache=True)(_fused_metrics_loop)
+    return _fused_metrics
+
+
+def _pearson(x: np.ndarray, y: np.ndarray) -> Tuple[float, float]:
+    """Corrélation de Pearson et p-value bilatérale (identique à scipy.stats.pearsonr)."""
+    n = len(x)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r = float(np.corrcoef(x, y)[0, 1])
+    
+    if n <= 2 or math.isnan(r):
+        return r, math.nan
+    
+    r = max(-1.0, min(1.0, r))
+    if abs(r) == 1.0:
+        return r, 0.0
+    
+    # Import différé comme sklearn : inutile pour --create-template
+    from scipy.special import stdtr
+    
+    t = r * math.sqrt((n - 2) / (1.0 - r * r))
+    return r, float(2 * stdtr(n - 2, -abs(t)))
+
+
+def _krippendorff_alpha_ordinal(cat_matrix: np.ndarray, n_categories: int = len(CATEGORY_BOUNDS) + 1) -> float:
+    """
+    Alpha de Krippendorff (niveau ordinal) via la matrice de coïncidences.
+    
+    cat_matrix : tableau (codeurs × unités) de catégories 0..K-1,
+    valeur négative = annotation manquante.
+    """
+    codes = np.asarray(cat_matrix, dtype=np.int64)
+    K = n_categories
+    n_units = codes.shape[1]
+    
+    # Nombre de valeurs de chaque catégorie par unité (unités × K)
+    unit_idx = np.broadcast_to(np.arange(n_units), codes.shape)
+    valid = codes >= 0
+    counts = np.bincount(
+        unit_idx[valid] * K + codes[valid], minlength=n_units * K
+    ).reshape(n_units, K).astype(np.float64)
+    
+    # Seules les unités codées au moins deux fois sont appariables
+    m_u = counts.sum(axis=1)
+    pairable = m_u >= 2
+    counts = counts[pairable]
+    weights = 1.0 / (m_u[pairable] - 1.0)
+    
+    # Matrice de coïncidences o_ck = Σ_u (n_uc·n_uk - [c=k]·n_uc) / (m_u - 1)
+    weighted = counts * weights[:, None]
+    coincidences = counts.T @ weighted - np.diag(weighted.sum(axis=0))
+    
+    n_c = coincidences.sum(axis=1)
+    n = n_c.sum()
+    if n <= 1:
+        return float('nan')
+    
+    # Distance ordinale : δ_ck = (Σ_{g=c..k} n_g - (n_c + n_k)/2)²
+    cumulative = np.cumsum(n_c)
+    lo = np.minimum.outer(np.arange(K), np.arange(K))
+    hi = np.maximum.outer(np.arange(K), np.arange(K))
+    between = cumulative[hi] - cumulative[lo] + n_c[lo]
+    delta = (between - (n_c[:, None] + n_c[None, :]) / 2.0) ** 2
+    
+    expected = (np.outer(n_c, n_c) * delta).sum()
+    if expected == 0:
+        return float('nan')
+    
+    observed = (coincidences * delta).sum()
+    return float(1.0 - (n - 1.0) * observed / expected)
 
 class InterCoderValidator:
     """Valide la fiabilité du système par validation inter-codage."""
@@ -36,40 +212,73 @@ class InterCoderValidator:
         self.scores_file = self.data_dir / "scores.csv"
         self.annotations_file = self.data_dir / "manual_annotations.csv"
         self.results_file = self.data_dir / "validation_results.json"
+        self.cache_dir = self.data_dir / ".cache"
         self.sample_size = sample_size
     
-    def load_articles(self) -> List[Dict]:
+    def load_articles(self) -> List[Article]:
         """Charge tous les articles."""
         if not self.articles_file.exists():
             print(f"❌ Fichier introuvable: {self.articles_file}")
             return []
         
-        articles = []
         with open(self.articles_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                articles.append(row)
-        
-        return articles
+            return list(_read_articles(f))
+    
+    def _load_cached(self, csv_file: Path, parse: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+        """
+        Relit le résultat de parse() depuis un cache Parquet dans data/.cache,
+        tant que le CSV n'a pas été modifié depuis (comparaison des mtime).
+        """
+        if not PYARROW_AVAILABLE:
+            return parse()
+        
+        cache_file = self.cache_dir / f"{csv_file.stem}.parquet"
+        if cache_file.exists() and cache_file.stat().st_mtime > csv_file.stat().st_mtime:
+            return pd.read_parquet(cache_file)
+        
+        df = parse()
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            df.to_parquet(cache_file, index=False, compression='zstd')
+        except OSError as e:
+            print(f"⚠️  Impossible d'écrire le cache {cache_file.name}: {e}")
+        
+        return df
+    
+    def _parse_scores(self) -> pd.DataFrame:
+        """Lit url, pct_militantisme et score_feministe dans scores.csv."""
+        df = pd.read_csv(
+            self.scores_file,
+            usecols=lambda c: c in ('url', 'pct_militantisme', 'score_feministe'),
+            dtype={'url': str, 'pct_militantisme': 'float64', 'score_feministe': 'float64'},
+            encoding='utf-8'
+        )
+        # Colonnes absentes ou cellules vides : 0, comme pour les articles sans score
+        for column in ('pct_militantisme', 'score_feministe'):
+            if column not in df.columns:
+                df[column] = 0.0
+        df['url'] = df['url'].fillna('')
+        df['pct_militantisme'] = df['pct_militantisme'].fillna(0.0)
+        # Entier étroit dès la lecture ; pct_militantisme reste en float64 pour
+        # être recopié à l'identique dans le template
+        df['score_feministe'] = df['score_feministe'].fillna(0).astype('int32')
+        # Une URL en double garde sa dernière ligne
+        df = df.drop_duplicates(subset='url', keep='last')
+        return df[['url', 'pct_militantisme', 'score_feministe']]
     
-    def load_scores(self) -> Dict[str, Dict]:
-        """Charge les scores automatiques."""
+    def load_scores(self) -> pd.DataFrame:
+        """Charge les scores automatiques (pct_militantisme, score_feministe), indexés par url."""
         if not self.scores_file.exists():
             print(f"❌ Fichier introuvable: {self.scores_file}")
-            return {}
-        
-        scores = {}
-        with open(self.scores_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                scores[row['url']] = {
-                    'pct_militantisme': float(row.get('pct_militantisme', 0)),
-                    'score_feministe': int(row.get('score_feministe', 0))
-                }
+            return pd.DataFrame(
+                {'pct_militantisme': pd.Series(dtype='float64'),
+                 'score_feministe': pd.Series(dtype='int32')},
+                index=pd.Index([], dtype=str, name='url')
+            )
         
-        return scores
+        return self._load_cached(self.scores_file, self._parse_scores).set_index('url')
     
-    def sample_articles(self, articles: List[Dict], n: Optional[int] = None) -> List[Dict]:
+    def sample_articles(self, articles: List[Article], n: Optional[int] = None) -> List[Article]:
         """Échantillonne aléatoirement des articles."""
         if n is None:
             n = self.sample_size
@@ -79,7 +288,52 @@ class InterCoderValidator:
         
         return random.sample(articles, n)
     
-    def create_annotation_template(self, sample: List[Dict], scores: Dict[str, Dict]):
+    def stream_sample_articles(self, n: Optional[int] = None) -> List[Article]:
+        """
+        Échantillonne aléatoirement des articles en lisant le CSV en flux.
+        
+        Reservoir sampling (algorithme L) : seuls n articles sont gardés en
+        mémoire, quelle que soit la taille de articles_clean.csv.
+        """
+        if n is None:
+            n = self.sample_size
+        
+        if not self.articles_file.exists():
+            print(f"❌ Fichier introuvable: {self.articles_file}")
+            return []
+        
+        if n <= 0:
+            return []
+        
+        def uniform() -> float:
+            # Tirage dans ]0, 1[ pour éviter log(0)
+            u = random.random()
+            while u == 0.0:
+                u = random.random()
+            return u
+        
+        reservoir = []
+        with open(self.articles_file, 'r', encoding='utf-8') as f:
+            reader = _read_articles(f)
+            
+            for row in reader:
+                reservoir.append(row)
+                if len(reservoir) == n:
+                    break
+            
+            w = math.exp(math.log(uniform()) / n)
+            next_index = n + int(math.log(uniform()) / math.log(1 - w))
+            
+            # Les n premières lignes sont déjà consommées par le reader
+            for index, row in enumerate(reader, start=n):
+                if index == next_index:
+                    reservoir[random.randrange(n)] = row
+                    w *= math.exp(math.log(uniform()) / n)
+                    next_index += int(math.log(uniform()) / math.log(1 - w)) + 1
+        
+        return reservoir
+    
+    def create_annotation_template(self, sample: List[Article], scores: pd.DataFrame):
         """Crée un fichier CSV pour l'annotation manuelle."""
         print(f"📝 Création du fichier d'annotation pour {len(sample)} articles...")
         
@@ -88,29 +342,32 @@ class InterCoderValidator:
             'manual_score', 'manual_category', 'notes'
         ]
         
-        with open(self.annotations_file, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            
-            for article in sample:
-                url = article['url']
-                title = article.get('title', '')[:100]
-                text = article.get('text', '')[:500]  # Aperçu de 500 caractères
-                
-                auto_score = scores.get(url, {})
-                auto_pct = auto_score.get('pct_militantisme', 0)
-                auto_score_val = auto_score.get('score_feministe', 0)
-                
-                writer.writerow({
-                    'url': url,
-                    'title': title,
-                    'text_preview': text,
-                    'auto_score': auto_score_val,
-                    'auto_pct': auto_pct,
-                    'manual_score': '',  # À remplir manuellement
-                    'manual_category': '',  # À remplir manuellement
-                    'notes': ''  # Notes optionnelles
-                })
+        # Scores de l'échantillon en une seule recherche vectorisée dans l'index
+        matched = scores.reindex([article.url for article in sample])
+        found = matched['score_feministe'].notna().tolist()
+        pcts = matched['pct_militantisme'].tolist()
+        auto_scores = matched['score_feministe'].tolist()
+        
+        def rows():
+            # Lignes dans l'ordre de fieldnames
+            for article, known, pct, score in zip(sample, found, pcts, auto_scores):
+                auto_pct, auto_score = (pct, int(score)) if known else _EMPTY_SCORE
+                yield (
+                    article.url,
+                    article.title[:100],
+                    article.text[:500],  # Aperçu de 500 caractères
+                    auto_score,
+                    auto_pct,
+                    '',  # manual_score : à remplir manuellement
+                    '',  # manual_category : à remplir manuellement
+                    ''   # notes : optionnelles
+                )
+        
+        # Tampon de 1 Mo : écritures regroupées en gros blocs
+        with open(self.annotations_file, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
+            writer = csv.writer(f)
+            writer.writerow(fieldnames)
+            writer.writerows(rows())
         
         print(f"✅ Fichier créé: {self.annotations_file}")
         print("\n📋 Instructions pour l'annotation:")
@@ -122,83 +379,97 @@ class InterCoderValidator:
         print("   3. Sauvegardez le fichier")
         print("   4. Relancez ce script avec --analyze pour calculer les métriques")
     
-    def load_annotations(self) -> List[Dict]:
-        """Charge les annotations manuelles."""
+    def load_annotations(self) -> pd.DataFrame:
+        """Charge les annotations manuelles (lignes annotées uniquement)."""
         if not self.annotations_file.exists():
             print(f"❌ Fichier d'annotation introuvable: {self.annotations_file}")
             print("   Créez-le d'abord avec --create-template")
-            return []
-        
-        annotations = []
-        with open(self.annotations_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                # Ignorer les lignes non annotées
-                if row.get('manual_score') and row['manual_score'].strip():
-                    try:
-                        row['manual_score'] = float(row['manual_score'])
-                        annotations.append(row)
-                    except ValueError:
-                        continue
+            return pd.DataFrame(columns=['url', 'auto_pct', 'manual_score'])
         
-        return annotations
+        return self._load_cached(self.annotations_file, self._parse_annotations)
+    
+    def _parse_annotations(self) -> pd.DataFrame:
+        """Lit manual_annotations.csv et ne garde que les lignes annotées."""
+        df = pd.read_csv(
+            self.annotations_file,
+            dtype={'manual_score': str, 'auto_pct': str},
+            keep_default_na=False,
+            encoding='utf-8'
+        )
+        if 'manual_score' not in df.columns or 'auto_pct' not in df.columns:
+            return df.iloc[0:0]
+        
+        # Ignorer les lignes non annotées (vides ou non numériques) : les cellules
+        # vides sont écartées par masque avant la conversion des seules restantes
+        # (auto_pct peut être vide sur les lignes non annotées, ex. lignes ",,,,"
+        # ajoutées par un tableur)
+        manual = df['manual_score'].astype('string').str.strip()
+        annotated = manual.notna() & (manual != '')
+        df = df.loc[annotated].assign(
+            manual_score=pd.to_numeric(manual[annotated], errors='coerce').astype('float64'),
+            auto_pct=pd.to_numeric(df.loc[annotated, 'auto_pct'].str.strip(), errors='coerce').astype('float64')
+        )
+        return df.dropna(subset=['manual_score', 'auto_pct'])
     
-    def calculate_metrics(self, annotations: List[Dict]) -> Dict:
+    def calculate_metrics(self, annotations: pd.DataFrame) -> Dict:
         """Calcule les métriques de fiabilité."""
+        # Import différé : --create-template n'a pas besoin de scikit-learn
+        try:
+            from sklearn.metrics import cohen_kappa_score, accuracy_score, precision_score, recall_score, f1_score
+        except ImportError:
+            print("⚠️  scikit-learn requis pour calculer les métriques")
+            print("   Installez avec: pip install scikit-learn")
+            return {}
+        
         if len(annotations) < 2:
             print("❌ Pas assez d'annotations (minimum 2 requis)")
             return {}
         
-        auto_scores = [float(a['auto_pct']) for a in annotations]
-        manual_scores = [float(a['manual_score']) for a in annotations]
+        auto_scores = annotations['auto_pct'].to_numpy(dtype=np.float64)
+        manual_scores = annotations['manual_score'].to_numpy(dtype=np.float64)
         
         # Corrélation de Pearson
-        correlation, p_corr = pearsonr(auto_scores, manual_scores)
+        correlation, p_corr = _pearson(auto_scores, manual_scores)
         
         # Catégorisation pour Kappa
-        # Convertir en catégories: 0-25 = faible, 25-50 = modéré, 50-75 = élevé, 75-100 = très élevé
-        def categorize(score):
-            if score < 25:
-                return 0  # Faible
-            elif score < 50:
-                return 1  # Modéré
-            elif score < 75:
-                return 2  # Élevé
-            else:
-                return 3  # Très élevé
-        
-        auto_categories = [categorize(s) for s in auto_scores]
-        manual_categories = [categorize(s) for s in manual_scores]
+        # Convertir en catégories: 0-25 = faible (0), 25-50 = modéré (1),
+        # 50-75 = élevé (2), 75-100 = très élevé (3)
+        # Classes binaires : "militant" = score >= 30
+        # Le tout en un seul parcours avec MAE et RMSE
+        (auto_categories, manual_categories,
+         auto_binary, manual_binary, mae, rmse) = _get_fused_metrics()(
+            auto_scores, manual_scores,
+            np.asarray(CATEGORY_BOUNDS, dtype=np.float64), float(MILITANT_THRESHOLD)
+        )
         
         # Coefficient Kappa de Cohen
         kappa = cohen_kappa_score(manual_categories, auto_categories)
         
-        # Précision, Rappel, F1 (en considérant "militant" = score >= 30)
-        auto_binary = [1 if s >= 30 else 0 for s in auto_scores]
-        manual_binary = [1 if s >= 30 else 0 for s in manual_scores]
+        # Alpha de Krippendorff (ordinal) sur les mêmes catégories
+        alpha = _krippendorff_alpha_ordinal(np.vstack([manual_categories, auto_categories]))
         
+        # Précision, Rappel, F1
         accuracy = accuracy_score(manual_binary, auto_binary)
         precision = precision_score(manual_binary, auto_binary, zero_division=0)
         recall = recall_score(manual_binary, auto_binary, zero_division=0)
         f1 = f1_score(manual_binary, auto_binary, zero_division=0)
         
-        # Erreur moyenne absolue (MAE)
-        mae = sum(abs(a - m) for a, m in zip(auto_scores, manual_scores)) / len(annotations)
-        
-        # Erreur quadratique moyenne (RMSE)
-        rmse = (sum((a - m) ** 2 for a, m in zip(auto_scores, manual_scores)) / len(annotations)) ** 0.5
-        
         return {
             'n_annotations': len(annotations),
             'correlation': {
                 'pearson_r': float(correlation),
                 'p_value': float(p_corr),
-                'is_significant': p_corr < 0.05
+                'is_significant': bool(p_corr < 0.05)
             },
             'kappa': {
                 'value': float(kappa),
                 'interpretation': self._interpret_kappa(kappa)
             },
+            'krippendorff_alpha': {
+                'value': alpha,
+                'level': 'ordinal',
+                'interpretation': self._interpret_alpha(alpha)
+            },
             'binary_classification': {
                 'accuracy': float(accuracy),
                 'precision': float(precision),
@@ -213,62 +484,65 @@ class InterCoderValidator:
     
     def _interpret_kappa(self, kappa: float) -> str:
         """Interprète le coefficient Kappa."""
-        if kappa < 0:
-            return "Accord pire que le hasard"
-        elif kappa < 0.2:
-            return "Accord faible"
-        elif kappa < 0.4:
-            return "Accord passable"
-        elif kappa < 0.6:
-            return "Accord modéré"
-        elif kappa < 0.8:
-            return "Accord bon"
-        else:
-            return "Accord excellent"
+        return KAPPA_LABELS[int(np.searchsorted(KAPPA_THRESHOLDS, kappa, side='right'))]
+    
+    def _interpret_alpha(self, alpha: float) -> str:
+        """Interprète l'alpha de Krippendorff (seuils usuels 0.667 / 0.8)."""
+        if alpha != alpha:
+            return "Non calculable"
+        return ALPHA_LABELS[int(np.searchsorted(ALPHA_THRESHOLDS, alpha, side='right'))]
     
     def print_results(self, metrics: Dict):
-        """Affiche les résultats de validation."""
-        print("\n" + "=" * 80)
-        print("📊 RÉSULTATS DE VALIDATION INTER-CODAGE")
-        print("=" * 80)
+        """Affiche les résultats de validation (une seule écriture sur stdout)."""
+        lines = []
+        lines.append("\n" + "=" * 80)
+        lines.append("📊 RÉSULTATS DE VALIDATION INTER-CODAGE")
+        lines.append("=" * 80)
         
-        print(f"\n📈 Nombre d'articles annotés: {metrics['n_annotations']}")
+        lines.append(f"\n📈 Nombre d'articles annotés: {metrics['n_annotations']}")
         
-        print("\n🔗 Corrélation:")
+        lines.append("\n🔗 Corrélation:")
         corr = metrics['correlation']
-        print(f"   Coefficient de Pearson (r) = {corr['pearson_r']:.3f}")
-        print(f"   p-value = {corr['p_value']:.4f}")
-        print(f"   Significatif: {'✅ Oui' if corr['is_significant'] else '❌ Non'}")
+        lines.append(f"   Coefficient de Pearson (r) = {corr['pearson_r']:.3f}")
+        lines.append(f"   p-value = {corr['p_value']:.4f}")
+        lines.append(f"   Significatif: {'✅ Oui' if corr['is_significant'] else '❌ Non'}")
         
-        print("\n📊 Coefficient Kappa de Cohen:")
+        lines.append("\n📊 Coefficient Kappa de Cohen:")
         kappa = metrics['kappa']
-        print(f"   Kappa = {kappa['value']:.3f}")
-        print(f"   Interprétation: {kappa['interpretation']}")
+        lines.append(f"   Kappa = {kappa['value']:.3f}")
+        lines.append(f"   Interprétation: {kappa['interpretation']}")
         
-        print("\n🎯 Classification binaire (militant vs non-militant):")
+        lines.append("\n📊 Alpha de Krippendorff (ordinal):")
+        alpha = metrics['krippendorff_alpha']
+        lines.append(f"   Alpha = {alpha['value']:.3f}")
+        lines.append(f"   Interprétation: {alpha['interpretation']}")
+        
+        lines.append("\n🎯 Classification binaire (militant vs non-militant):")
         binary = metrics['binary_classification']
-        print(f"   Précision = {binary['precision']:.3f}")
-        print(f"   Rappel = {binary['recall']:.3f}")
-        print(f"   F1-Score = {binary['f1_score']:.3f}")
-        print(f"   Exactitude = {binary['accuracy']:.3f}")
+        lines.append(f"   Précision = {binary['precision']:.3f}")
+        lines.append(f"   Rappel = {binary['recall']:.3f}")
+        lines.append(f"   F1-Score = {binary['f1_score']:.3f}")
+        lines.append(f"   Exactitude = {binary['accuracy']:.3f}")
         
-        print("\n📉 Métriques de régression:")
+        lines.append("\n📉 Métriques de régression:")
         reg = metrics['regression_metrics']
-        print(f"   Erreur moyenne absolue (MAE) = {reg['mae']:.2f}")
-        print(f"   Erreur quadratique moyenne (RMSE) = {reg['rmse']:.2f}")
+        lines.append(f"   Erreur moyenne absolue (MAE) = {reg['mae']:.2f}")
+        lines.append(f"   Erreur quadratique moyenne (RMSE) = {reg['rmse']:.2f}")
+        
+        lines.append("\n✅ Objectifs de qualité:")
+        lines.append(f"   Kappa > 0.7: {'✅ Atteint' if kappa['value'] > 0.7 else '❌ Non atteint'}")
+        lines.append(f"   F1 > 0.75: {'✅ Atteint' if binary['f1_score'] > 0.75 else '❌ Non atteint'}")
+        lines.append(f"   Corrélation > 0.8: {'✅ Atteint' if corr['pearson_r'] > 0.8 else '❌ Non atteint'}")
         
-        print("\n✅ Objectifs de qualité:")
-        print(f"   Kappa > 0.7: {'✅ Atteint' if kappa['value'] > 0.7 else '❌ Non atteint'}")
-        print(f"   F1 > 0.75: {'✅ Atteint' if binary['f1_score'] > 0.75 else '❌ Non atteint'}")
-        print(f"   Corrélation > 0.8: {'✅ Atteint' if corr['pearson_r'] > 0.8 else '❌ Non atteint'}")
+        lines.append("=" * 80)
         
-        print("=" * 80)
+        sys.stdout.write("\n".join(lines) + "\n")
     
     def run_validation(self):
         """Lance la validation complète."""
         annotations = self.load_annotations()
         
-        if not annotations:
+        if annotations.empty:
             return
         
         metrics = self.calculate_metrics(annotations)
@@ -306,12 +580,11 @@ def main():
     validator = InterCoderValidator(sample_size=args.sample_size)
     
     if args.create_template:
-        articles = validator.load_articles()
-        if not articles:
+        sample = validator.stream_sample_articles()
+        if not sample:
             return
         
         scores = validator.load_scores()
-        sample = validator.sample_articles(articles)
         validator.create_annotation_template(sample, scores)
     
     elif args.analyze: